@@ -0,0 +1,55 @@
+import os
+
+from normalize import load_csv
+
+# ============================================================================
+# SUMMARY AND PLOTS
+# ============================================================================
+# The analysis the scripts printed after saving, for any output CSV. Only
+# imported once a harvest has finished (harvest.py --summary / --plot), so
+# pandas and matplotlib never slow down the start of a harvest.
+
+
+def summarize(csv_path, top=5):
+    """Print totals and the top newspapers/cities/years of an output CSV; returns the DataFrame"""
+    df = load_csv(csv_path)
+    print(f"📊 ANALYSIS: {csv_path}")
+    print(f"   Total articles: {len(df)}")
+    if df.empty:
+        return df
+    print(f"   Newspapers: {df['Newspaper Title'].nunique()}")
+    print(f"   Cities: {df['City'].nunique()}")
+    dates = df['Issue Date'].dropna()
+    if not dates.empty:
+        print(f"   Issues: {dates.min():%Y-%m-%d} to {dates.max():%Y-%m-%d}")
+        print("   By year: " + ", ".join(f"{year}: {count}" for year, count
+                                         in dates.dt.year.value_counts().sort_index().items()))
+    print("📰 Top newspapers:")
+    for paper, count in df['Newspaper Title'].value_counts().head(top).items():
+        print(f"   {paper}: {count} articles")
+    print("🏙️  Top cities:")
+    for city, count in df['City'].value_counts().head(top).items():
+        print(f"   {city}: {count} articles")
+    return df
+
+
+def plot_newspapers(df, path, top=15):
+    """Bar chart of articles per newspaper, saved as an image (needs matplotlib)"""
+    try:
+        import matplotlib
+    except ImportError:
+        raise ImportError("Plots need matplotlib: pip install matplotlib") from None
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    counts = df['Newspaper Title'].value_counts().head(top).sort_values()
+    fig, ax = plt.subplots(figsize=(10, max(3, len(counts) * 0.4)))
+    counts.plot.barh(ax=ax)
+    ax.set_xlabel('Articles')
+    ax.set_ylabel('')
+    ax.set_title(os.path.splitext(os.path.basename(path))[0])
+    fig.tight_layout()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    fig.savefig(path)
+    plt.close(fig)
+    return path
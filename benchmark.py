@@ -0,0 +1,321 @@
+import argparse
+import asyncio
+import contextlib
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import httpx
+
+# ============================================================================
+# THROUGHPUT BENCHMARK
+# ============================================================================
+# Runs the whole search -> item metadata -> CSV pipeline against mock_loc.py
+# for a few fixed scenarios and reports, per scenario:
+#   - items/min        output rows per minute of wall time
+#   - requests/row     HTTP requests sent (429s included) per output row
+#   - p50/p95 latency  request sent -> response body read, per request
+#   - peak RSS, CPU    of the harvesting process (sampled with psutil)
+# Each scenario runs in a fresh interpreter, so memory and CPU are its own;
+# the mock server runs in this process and is not counted.
+#
+#   python benchmark.py                    # run, compare with the baseline
+#   python benchmark.py --save-baseline    # run, store as the new baseline
+#   python benchmark.py --compare latest   # compare the last run, no rerun
+#
+# quick_test.py, test_wv_query.py and test_dec_2.py stay the live probes.
+
+BENCHMARK_DIR = 'benchmarks'
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+LATEST_PATH = os.path.join(BENCHMARK_DIR, 'latest.json')
+
+ALL_STATES = ['CT', 'NJ', 'NY', 'PA', 'RI', 'VA', 'WV']
+
+# fixtures: 'csv' (output/*.csv) or a number of synthetic pages
+# server: mock_loc.MockLocServer options; harvest: the harvest.py settings
+SCENARIOS = {
+    'csv_item': {
+        'fixtures': 'csv',
+        'server': {'latency': 0.03, 'jitter': 0.5},
+        'harvest': {'states': ALL_STATES, 'ranges': [('1872-01-01', '1874-12-31')]},
+    },
+    # Search results lack Contributor and Batch; allowing them to be empty is
+    # what lets search mode skip the item requests
+    'csv_search': {
+        'fixtures': 'csv',
+        'server': {'latency': 0.03, 'jitter': 0.5},
+        'harvest': {'states': ALL_STATES, 'ranges': [('1872-01-01', '1874-12-31')],
+                    'extract': 'search', 'allow_missing': ['Contributor', 'Batch']},
+    },
+    'synthetic_chunked': {
+        'fixtures': 3000,
+        'server': {'latency': 0.02, 'jitter': 0.5},
+        'harvest': {'states': ['NY', 'WV'], 'ranges': [('1870-01-01', '1874-12-31')],
+                    'chunk_size': 250},
+    },
+    # A few 429s: every one halves the limiter's rate (AIMD) and pauses it
+    'throttled': {
+        'fixtures': 'csv',
+        'server': {'latency': 0.03, 'jitter': 0.5, 'error_rate': 0.005, 'retry_after': 1},
+        'harvest': {'states': ['NY'], 'ranges': [('1872-01-01', '1874-12-31')]},
+    },
+}
+
+HARVEST_DEFAULTS = {
+    'keywords': ['coolie'],
+    'extract': 'item',
+    'allow_missing': [],
+    'chunk_size': None,
+    'connections': 8,
+    'per_job_concurrency': 4,
+    'requests_per_minute': 30000,  # high enough that latency and concurrency set the pace
+    'burst': 20,
+}
+
+# Metric -> (label, format, +1 if higher is better / -1 if lower is better)
+METRICS = {
+    'items_per_min': ('items/min', '{:.0f}', 1),
+    'requests_per_row': ('requests/row', '{:.2f}', -1),
+    'latency_p50': ('p50 latency', '{:.3f}s', -1),
+    'latency_p95': ('p95 latency', '{:.3f}s', -1),
+    'peak_rss_mb': ('peak RSS', '{:.0f} MB', -1),
+    'cpu_seconds': ('CPU', '{:.2f}s', -1),
+}
+
+
+def _psutil():
+    try:
+        import psutil
+    except ImportError:
+        raise ImportError("The benchmark needs psutil: pip install psutil") from None
+    return psutil
+
+
+class TimedTransport(httpx.AsyncHTTPTransport):
+    """Pooled transport that records each request's latency and status"""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.latencies = []
+        self.statuses = Counter()
+
+    async def handle_async_request(self, request):
+        start = time.perf_counter()
+        response = await super().handle_async_request(request)
+        await response.aread()
+        self.latencies.append(time.perf_counter() - start)
+        self.statuses[response.status_code] += 1
+        return response
+
+
+class PeakRss:
+    """Background thread sampling this process's RSS"""
+
+    def __init__(self, interval=0.01):
+        self.process = _psutil().Process()
+        self.interval = interval
+        self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[q - 1]
+
+
+# ============================================================================
+# ONE SCENARIO (child process)
+# ============================================================================
+
+def run_harvest(name, base_url, workdir):
+    """Harvest one scenario from the mock server; returns its measurements"""
+    psutil = _psutil()
+    from rate_limiter import TokenBucketLimiter
+    from scheduler import JobScheduler, job_matrix
+    from sinks import CSV_COLUMNS
+    from work_queue import WorkQueue
+
+    options = {**HARVEST_DEFAULTS, **SCENARIOS[name]['harvest']}
+    process = psutil.Process()
+    cpu = process.cpu_times()
+    transport = TimedTransport(limits=httpx.Limits(max_connections=options['connections'],
+                                                   max_keepalive_connections=options['connections']))
+    with PeakRss() as rss, open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        jobs = job_matrix(options['keywords'], options['states'], options['ranges'], save_to=workdir)
+        work_queue = WorkQueue(os.path.join(workdir, 'work_queue.sqlite'))
+        scheduler = JobScheduler(jobs, limiter=TokenBucketLimiter(rate=options['requests_per_minute'] / 60,
+                                                                  burst=options['burst']),
+                                 max_connections=options['connections'],
+                                 per_job_concurrency=options['per_job_concurrency'],
+                                 target_chunk_size=options['chunk_size'], work_queue=work_queue,
+                                 extract=options['extract'], base_url=base_url, transport=transport,
+                                 required_fields=[field for field in CSV_COLUMNS
+                                                  if field not in options['allow_missing']])
+        asyncio.run(scheduler.run())
+        work_queue.close()
+        elapsed = time.perf_counter() - started
+    cpu_after = process.cpu_times()
+
+    rows = sum(job.rows for job in jobs)
+    requests = len(transport.latencies)
+    return {
+        'rows': rows,
+        'requests': requests,
+        'rate_limited': transport.statuses.get(429, 0),
+        'seconds': elapsed,
+        'items_per_min': rows / elapsed * 60 if elapsed else None,
+        'requests_per_row': requests / rows if rows else None,
+        'latency_p50': percentile(transport.latencies, 50),
+        'latency_p95': percentile(transport.latencies, 95),
+        'peak_rss_mb': rss.peak / 1024 ** 2,
+        'cpu_seconds': (cpu_after.user - cpu.user) + (cpu_after.system - cpu.system),
+    }
+
+
+# ============================================================================
+# SUITE (parent process)
+# ============================================================================
+
+def build_fixtures(source, cache):
+    from mock_loc import Fixtures
+
+    if source not in cache:
+        if source == 'csv':
+            cache[source] = Fixtures.from_csv(sorted(glob.glob(os.path.join('output', '*.csv'))))
+        else:
+            cache[source] = Fixtures.synthetic(source)
+    return cache[source]
+
+
+def run_scenario(name, fixtures, repeat=1):
+    """Median measurements of `repeat` runs of one scenario, each in a fresh interpreter"""
+    from mock_loc import MockLocServer
+
+    runs = []
+    for _ in range(repeat):
+        with MockLocServer(fixtures, **SCENARIOS[name]['server']) as server, \
+                tempfile.TemporaryDirectory() as workdir:
+            result = subprocess.run([sys.executable, __file__, '--child', name, server.base_url, workdir],
+                                    capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Scenario {name} failed:\n{result.stderr}")
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {key: (statistics.median(run[key] for run in runs) if runs[0][key] is not None else None)
+            for key in runs[0]}
+
+
+def run_suite(names=None, repeat=1):
+    fixtures = {}
+    results = {}
+    print(f"🏁 HARVEST BENCHMARK ({repeat} run(s) per scenario)")
+    for name in names or SCENARIOS:
+        result = run_scenario(name, build_fixtures(SCENARIOS[name]['fixtures'], fixtures), repeat)
+        results[name] = result
+        print(f"   {name}: {result['rows']:.0f} rows, {result['requests']:.0f} requests "
+              f"({result['rate_limited']:.0f} rate limited) in {result['seconds']:.1f}s")
+    return results
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'recorded': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'machine': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpus': os.cpu_count()},
+            'scenarios': results,
+        }, f, indent=2)
+    print(f"💾 Saved to {path}")
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)['scenarios']
+
+
+def compare(results, baseline, tolerance=0.15):
+    """Print each metric against the baseline; returns the regressions beyond `tolerance`"""
+    regressions = []
+    print(f"📊 COMPARISON WITH BASELINE (regression = more than {tolerance:.0%} worse):")
+    for name, result in results.items():
+        base = baseline.get(name)
+        print(f"   {name}:")
+        for metric, (label, fmt, direction) in METRICS.items():
+            value = result.get(metric)
+            if value is None:
+                continue
+            line = f"      {label}: {fmt.format(value)}"
+            old = (base or {}).get(metric)
+            if old:
+                change = (value - old) / old
+                worse = -change * direction > tolerance
+                line += f" (baseline {fmt.format(old)}, {change:+.0%}) {'❌' if worse else '✅'}"
+                if worse:
+                    regressions.append((name, label, old, value))
+            print(line)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s)")
+    else:
+        print("✅ No regressions")
+    return regressions
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+if __name__ == '__main__':
+    if len(sys.argv) == 5 and sys.argv[1] == '--child':
+        print(json.dumps(run_harvest(*sys.argv[2:])))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description="Benchmark the harvest pipeline against mock_loc.py")
+    parser.add_argument('scenarios', nargs='*', metavar='SCENARIO',
+                        help=f"Default: all of {', '.join(SCENARIOS)}")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per scenario; the median is reported")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the baseline")
+    parser.add_argument('--compare', default=None, metavar='RESULTS',
+                        help="Compare an earlier results file ('latest' for the last run) instead of running")
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    if args.compare:
+        results = load_results(LATEST_PATH if args.compare == 'latest' else args.compare)
+    else:
+        results = run_suite(args.scenarios, args.repeat)
+        save_results(results, args.baseline if args.save_baseline else LATEST_PATH)
+    if args.save_baseline:
+        sys.exit(0)
+    if not os.path.exists(args.baseline):
+        print(f"⚠️  No baseline at {args.baseline}; run with --save-baseline first")
+        sys.exit(0)
+    sys.exit(1 if compare(results, load_results(args.baseline), args.tolerance) else 0)
@@ -0,0 +1,111 @@
+import argparse
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+# ============================================================================
+# KILL-AND-RESUME CHECK
+# ============================================================================
+# Fails (exit code 1) when `harvest.py --resume` no longer picks up a killed
+# run correctly. Against a mock_loc.py server it:
+#   1. starts two overlapping jobs (WV 1870-1874 and 1872-1874), so the same
+#      pages are in the work queue under two searches
+#   2. SIGKILLs the harvest once some items are done - no cleanup runs
+#   3. reruns the same command with --resume until it finishes
+# and then checks that every job's CSV holds each of its pages exactly once
+# and that no item was attempted more than twice (once per run). It runs
+# once unchunked and once with --chunk-size, where both jobs plan the same
+# chunk URLs for 1872-1874.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RANGES = [('1870-01-01', '1874-12-31'), ('1872-01-01', '1874-12-31')]
+
+
+def harvest_command(base_url, workdir, resume=False, chunk_size=None):
+    command = [sys.executable, os.path.join(SCRIPT_DIR, 'harvest.py'), '--base-url', base_url,
+               '--states', 'WV', '--ranges', *(f"{start}:{end}" for start, end in RANGES),
+               '--save-to', workdir, '--queue', os.path.join(workdir, 'work_queue.sqlite'),
+               '--requests-per-minute', '60000', '--burst', '50', '--progress-every', '0']
+    if chunk_size:
+        command += ['--chunk-size', str(chunk_size)]
+    return command + ['--resume'] if resume else command
+
+
+def done_items(queue_path):
+    if not os.path.exists(queue_path):
+        return 0
+    db = sqlite3.connect(queue_path)
+    try:
+        return db.execute("SELECT COUNT(*) FROM items WHERE state = 'done'").fetchone()[0]
+    except sqlite3.OperationalError:  # tables not created yet
+        return 0
+    finally:
+        db.close()
+
+
+def check_resume(pages=2000, kill_after=200, latency=0.02, timeout=300, chunk_size=None):
+    """True if a run killed after `kill_after` items resumes to complete, duplicate-free output"""
+    from mock_loc import Fixtures, MockLocServer
+    from normalize import load_csv
+    from scheduler import job_matrix
+
+    fixtures = Fixtures.synthetic(pages)
+    ok = True
+    chunks = f", chunks of {chunk_size}" if chunk_size else ""
+    print(f"♻️  KILL-AND-RESUME: {pages} mock pages, kill after {kill_after} items{chunks}")
+    with MockLocServer(fixtures, latency=latency) as server, tempfile.TemporaryDirectory() as workdir:
+        queue_path = os.path.join(workdir, 'work_queue.sqlite')
+        with open(os.devnull, 'w') as devnull:
+            process = subprocess.Popen(harvest_command(server.base_url, workdir, chunk_size=chunk_size), cwd=SCRIPT_DIR,
+                                       stdout=devnull, stderr=subprocess.STDOUT)
+            deadline = time.monotonic() + timeout
+            while process.poll() is None and done_items(queue_path) < kill_after:
+                if time.monotonic() > deadline:
+                    break
+                time.sleep(0.05)
+            if process.poll() is not None:
+                print(f"   ❌ Harvest ended before it could be killed (exit code {process.returncode})")
+                return False
+            process.send_signal(signal.SIGKILL)
+            process.wait()
+        print(f"   Killed with {done_items(queue_path)} items done")
+
+        result = subprocess.run(harvest_command(server.base_url, workdir, resume=True, chunk_size=chunk_size),
+                                cwd=SCRIPT_DIR, capture_output=True, text=True, timeout=timeout)
+        if result.returncode != 0:
+            print(f"   ❌ Resumed run failed:\n{result.stdout[-2000:]}{result.stderr[-2000:]}")
+            return False
+
+        for job in job_matrix(['coolie'], ['WV'], RANGES, save_to=workdir):
+            expected = {fixture.result['resources'][0]['pdf']
+                        for fixture in fixtures.search('coolie', job.state, job.start_date, job.end_date)}
+            links = list(load_csv(job.output)['PDF Link'])
+            complete = set(links) == expected and len(links) == len(expected)
+            ok &= complete
+            print(f"   {'✅' if complete else '❌'} {job.name}: {len(links)} rows, "
+                  f"{len(set(links))} distinct, {len(expected)} expected")
+
+        db = sqlite3.connect(queue_path)
+        attempts, unfinished = db.execute(
+            "SELECT MAX(attempts), SUM(state != 'done') FROM items").fetchone()
+        db.close()
+        within = attempts <= 2 and not unfinished
+        ok &= within
+        print(f"   {'✅' if within else '❌'} Work queue: at most {attempts} attempts per item, "
+              f"{unfinished} unfinished")
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Kill a mock harvest mid-run and check that --resume completes it")
+    parser.add_argument('--pages', type=int, default=2000, help="synthetic mock pages")
+    parser.add_argument('--kill-after', type=int, default=200, help="items done before the kill")
+    parser.add_argument('--chunk-size', type=int, default=50, help="--chunk-size of the chunked run")
+    args = parser.parse_args()
+    results = [check_resume(args.pages, args.kill_after, chunk_size=chunk_size)
+               for chunk_size in (None, args.chunk_size)]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,65 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# ============================================================================
+# STARTUP-TIME BUDGET
+# ============================================================================
+# Fails (exit code 1) when the harvest CLI gets slow to start again, e.g.
+# because someone adds a top-level pandas/matplotlib import on the fetch path:
+#   - `harvest.py --help` and importing everything the harvest itself runs
+#     must each finish (median of several runs) within the budget
+#   - none of the heavy analysis libraries may be loaded by that import
+
+# Everything a harvest imports before the first request is sent
+HARVEST_PATH = ['harvest', 'scheduler', 'harvest_engine', 'http_cache', 'item_store', 'work_queue',
+                'checkpoint', 'planner', 'sinks', 'records', 'profiling', 'progress',
+                'seen_set']
+
+# Only allowed once the summary/export stages run
+HEAVY_MODULES = ['pandas', 'numpy', 'matplotlib', 'plotly', 'pyarrow']
+
+IMPORT_CHECK = (f"import sys\nimport {', '.join(HARVEST_PATH)}\n"
+                f"print(','.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+
+
+def time_command(command, runs):
+    """Median wall time of `runs` fresh interpreter runs, plus the last run's stdout"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True)
+        timings.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(command)} failed:\n{result.stderr}")
+    return statistics.median(timings), result.stdout
+
+
+def check_startup(budget=0.5, runs=5):
+    """True if the CLI and the harvest imports start within `budget` seconds without heavy modules"""
+    ok = True
+    print(f"⏱️  STARTUP BUDGET: {budget:.2f}s (median of {runs} runs)")
+
+    baseline, _ = time_command([sys.executable, '-c', 'pass'], runs)
+    print(f"   Bare interpreter: {baseline:.3f}s")
+
+    for name, command in (('harvest.py --help', [sys.executable, 'harvest.py', '--help']),
+                          ('harvest-path imports', [sys.executable, '-c', IMPORT_CHECK])):
+        seconds, output = time_command(command, runs)
+        within = seconds <= budget
+        ok &= within
+        print(f"   {'✅' if within else '❌'} {name}: {seconds:.3f}s")
+        if name == 'harvest-path imports' and output.strip():
+            ok = False
+            print(f"   ❌ Heavy modules loaded on the harvest path: {output.strip()}")
+    return ok
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Fail if the harvest CLI starts slower than the budget")
+    parser.add_argument('--budget', type=float, default=0.5, help="seconds")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(0 if check_startup(args.budget, args.runs) else 1)
@@ -0,0 +1,110 @@
+import json
+import os
+import time
+
+# ============================================================================
+# APPEND-ONLY CHECKPOINT JOURNAL (JSONL)
+# ============================================================================
+# Replaces the progress_backup_{n}.json dumps, which rewrote the whole
+# item list every 10 items (O(n^2) bytes, one new file each time). Every
+# finished search page and every finished item is appended ONCE as a JSON
+# line; writes are fsync'ed in batches. Reopening the journal replays it in
+# one linear scan, and a half-written last line from a crash is ignored.
+# Only the replayed state is held in memory, not the rows of the run itself.
+#
+#   {"type": "page", "search": <search url>, "next": <next page url|null>, "ids": [...]}
+#   {"type": "item", "id": <item id>, "row": {...}}
+
+
+class JournalState:
+    """Everything a restart needs, rebuilt from the journal"""
+
+    def __init__(self):
+        self.cursors = {}
+        self.page_ids = {}
+        self.rows = {}
+
+    def apply(self, record):
+        if record['type'] == 'page':
+            self.cursors[record['search']] = record['next']
+            self.page_ids.setdefault(record['search'], []).extend(record['ids'])
+        elif record['type'] == 'item':
+            self.rows[record['id']] = record['row']
+
+    def resume_state(self, search_url):
+        """(next page URL or None, IDs seen but not finished) or None if never started"""
+        if search_url not in self.cursors:
+            return None
+        pending = [item_id for item_id in self.page_ids.get(search_url, [])
+                   if item_id not in self.rows]
+        return self.cursors[search_url], pending
+
+    def done_rows(self, search_url):
+        return [self.rows[item_id] for item_id in self.page_ids.get(search_url, [])
+                if item_id in self.rows]
+
+
+class CheckpointJournal:
+    """Append-only JSONL journal of finished pages and items, fsync'ed in batches"""
+
+    def __init__(self, path, sync_every=50, sync_interval=5.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.state = self.replay(path)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'a', encoding='utf-8')
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    @staticmethod
+    def replay(path):
+        """Rebuild JournalState in a single pass over the file"""
+        state = JournalState()
+        if not os.path.exists(path):
+            return state
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    state.apply(json.loads(line))
+                except (ValueError, KeyError):
+                    continue  # torn write from a crash
+        return state
+
+    def _append(self, record):
+        # Only written: self.state is read as each search starts, so it needs
+        # the replayed records, and this run's rows would pile up in memory
+        self.file.write(json.dumps(record) + '\n')
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    # Hooks called by harvest_engine.Harvester
+    def resume_state(self, search_url):
+        return self.state.resume_state(search_url)
+
+    def done_rows(self, search_url):
+        return self.state.done_rows(search_url)
+
+    def page_done(self, search_url, next_url, item_ids):
+        self._append({'type': 'page', 'search': search_url, 'next': next_url, 'ids': item_ids})
+
+    # One journal per job, whose chunks don't overlap: items are keyed by ID alone
+    def item_started(self, search_url, item_id):
+        pass
+
+    def item_done(self, search_url, item_id, row):
+        self._append({'type': 'item', 'id': item_id, 'row': dict(row)})
+
+    def item_failed(self, search_url, item_id):
+        pass
+
+    def close(self):
+        self.sync()
+        self.file.close()
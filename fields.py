@@ -0,0 +1,36 @@
+import sys
+
+# ============================================================================
+# LIST-VALUED FIELDS
+# ============================================================================
+# loc.gov returns most item fields as lists - newspaper_title ['The New York
+# herald.'], number_lccn ['sn83030313'], location_city ['new york'] - which
+# pandas wrote out as "['sn83030313']". Rows are unwrapped to plain scalars
+# when they are extracted (several values joined with '; '), and the repeated
+# low-cardinality strings are interned so every row shares one object. In a
+# DataFrame those columns become categoricals (normalize.categorize).
+#
+# Kept free of pandas: this runs on the harvest path, which should start fast.
+
+LIST_FIELDS = ('Newspaper Title', 'LCCN', 'City', 'State', 'Contributor', 'Batch')
+CATEGORY_FIELDS = ('Newspaper Title', 'City', 'State', 'Contributor', 'Batch')
+
+
+def scalar(value):
+    """['sn83030313'] -> 'sn83030313'; multi-valued lists joined with '; '"""
+    if isinstance(value, (list, tuple)):
+        if len(value) == 1:
+            return value[0]
+        return '; '.join(str(part) for part in value) if value else None
+    return None if value == '' else value
+
+
+def normalize_row(row):
+    """Unwrap the list-valued fields of a metadata row in place and intern them"""
+    for field in LIST_FIELDS:
+        if field in row:
+            value = scalar(row[field])
+            if isinstance(value, str) and field in CATEGORY_FIELDS:
+                value = sys.intern(value)
+            row[field] = value
+    return row
@@ -0,0 +1,252 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# ============================================================================
+# COMMAND-LINE ENTRY POINT
+# ============================================================================
+#   python harvest.py --states NY WV --ranges 1872-01-01:1874-12-31 --summary
+#   python harvest.py --config configs/west_virginia_1870_1874.toml
+#
+# One engine for every query: keyword, states, date ranges and sink options
+# come from the flags or a TOML config file (same names, flags win), so
+# pooling, caching and concurrency apply to every harvest at once instead of
+# being copied into one script per query.
+#
+# Only argparse is imported up front. The harvest path pulls in httpx, the
+# scheduler and the stores once the arguments are parsed; pandas (summary)
+# and matplotlib (plots) only load after the harvest, if asked for. Startup
+# time is kept in budget by check_startup.py.
+
+DEFAULT_STATES = ['CT', 'NJ', 'NY', 'PA', 'RI', 'VA', 'WV']
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run a matrix of Chronicling America queries")
+    parser.add_argument('--config', default=None, metavar='PATH',
+                        help="TOML file of options (keys as the flags, e.g. states = [\"WV\"]); flags override it")
+    parser.add_argument('--keywords', nargs='+', default=['coolie'])
+    parser.add_argument('--states', nargs='+', default=DEFAULT_STATES)
+    parser.add_argument('--ranges', nargs='+', default=['1872-01-01:1874-12-31'],
+                        help="START:END date ranges, e.g. 1870-01-01:1874-12-31")
+    parser.add_argument('--save-to', default='output')
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--requests-per-minute', type=float, default=10,
+                        help="Starting rate of the shared limiter (adapts on 429s)")
+    parser.add_argument('--burst', type=int, default=3, help="Requests the limiter may send back to back")
+    parser.add_argument('--base-url', default=None, metavar='URL',
+                        help="Send loc.gov requests to this server instead, e.g. mock_loc.py's http://127.0.0.1:8765")
+    parser.add_argument('--per-job-concurrency', type=int, default=4)
+    parser.add_argument('--http2', action='store_true', help="Multiplex requests over HTTP/2 (needs h2)")
+    parser.add_argument('--keepalive', type=float, default=30.0, metavar='SECONDS',
+                        help="How long idle pooled connections stay open")
+    parser.add_argument('--extract', choices=['item', 'search'], default='item',
+                        help="'search' builds rows from search results, fetching item JSON only for missing fields")
+    parser.add_argument('--allow-missing', nargs='+', default=[], metavar='FIELD',
+                        help="With --extract search, leave these columns empty when the search result "
+                             "lacks them instead of fetching the item, e.g. Contributor Batch")
+    parser.add_argument('--parquet', default=None, metavar='DIR',
+                        help="Also write a Parquet dataset partitioned by State/Year (needs pyarrow)")
+    parser.add_argument('--cache', default=None, metavar='PATH',
+                        help="SQLite response cache, e.g. cache/http_cache.sqlite")
+    parser.add_argument('--cache-ttl-days', type=float, default=30)
+    parser.add_argument('--item-store', default=None, metavar='PATH',
+                        help="SQLite item metadata store shared across runs, e.g. cache/items.sqlite")
+    parser.add_argument('--seen-set', default=None, metavar='PATH',
+                        help="Remember harvested pages and fetch each one once across jobs and runs, "
+                             "e.g. cache/seen.sqlite (needs --item-store, which holds the rows)")
+    parser.add_argument('--bloom', action='store_true',
+                        help="Front --seen-set with an in-memory Bloom filter (for sets larger than RAM cache)")
+    parser.add_argument('--journal-dir', default=None, metavar='DIR',
+                        help="Append-only checkpoint journal per job; rerunning resumes from it")
+    parser.add_argument('--queue', default=os.path.join('cache', 'work_queue.sqlite'), metavar='PATH',
+                        help="SQLite work queue recording search cursors and item states")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue the run recorded in --queue instead of starting over")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="Split each date range until every chunk has at most this many results")
+    parser.add_argument('--json-decoder', choices=['json', 'orjson'], default=None,
+                        help="JSON decoder for responses (default: orjson if installed)")
+    parser.add_argument('--skim-search', action='store_true',
+                        help="Stream only result ids/formats out of search pages (needs ijson; item mode)")
+    parser.add_argument('--metrics-port', type=int, default=None, metavar='PORT',
+                        help="Serve Prometheus metrics on this port while harvesting (needs prometheus_client)")
+    parser.add_argument('--metrics-addr', default='127.0.0.1', metavar='ADDR',
+                        help="Address the metrics server binds to, e.g. 0.0.0.0 for every interface")
+    parser.add_argument('--progress-every', type=float, default=30, metavar='SECONDS',
+                        help="Print per-job ETAs this often (0 = never)")
+    parser.add_argument('--profile', default=None, metavar='PATH',
+                        help="Save the run profile (time in network, limiter, parsing, I/O) as JSON")
+    parser.add_argument('--summary', action='store_true',
+                        help="Print newspaper/city/year counts for each output CSV afterwards (loads pandas)")
+    parser.add_argument('--plot', default=None, metavar='DIR',
+                        help="Save an articles-per-newspaper chart per job to DIR (loads matplotlib)")
+    return parser
+
+
+def load_config(path):
+    """Options from a TOML config file, keyed like the flags ('save_to' or 'save-to')"""
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        import tomli as tomllib
+    with open(path, 'rb') as f:
+        config = tomllib.load(f)
+    return {key.replace('-', '_'): value for key, value in config.items()}
+
+
+def parse_args(argv=None, parser=None):
+    """Flags on top of the --config file on top of the defaults"""
+    parser = parser or build_parser()
+    args, _ = parser.parse_known_args(argv)
+    if args.config:
+        config = load_config(args.config)
+        known = {action.dest for action in parser._actions} - {'help', 'config'}
+        unknown = sorted(set(config) - known)
+        if unknown:
+            parser.error(f"unknown option(s) in {args.config}: {', '.join(unknown)}")
+        for key in ('keywords', 'states', 'ranges'):
+            if isinstance(config.get(key), str):
+                config[key] = [config[key]]
+        parser.set_defaults(**config)
+    return parser.parse_args(argv)
+
+
+def check_args(args):
+    """(date ranges, required fields) of the parsed arguments
+
+    Raises ValueError for an unknown state or column, a malformed range and
+    --seen-set without --item-store.
+    """
+    from scheduler import state_name
+    from sinks import CSV_COLUMNS
+
+    for state in args.states:
+        state_name(state)
+    date_ranges = []
+    for value in args.ranges:
+        start, _, end = value.partition(':')
+        if not (start and end):
+            raise ValueError(f"Date range must be START:END, not {value!r}")
+        date_ranges.append((start, end))
+    if args.seen_set and not args.item_store:
+        raise ValueError("--seen-set needs --item-store: the rows of seen pages come from it")
+    unknown = [field for field in args.allow_missing if field not in CSV_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for --allow-missing: {', '.join(unknown)}")
+    return date_ranges, [field for field in CSV_COLUMNS if field not in args.allow_missing]
+
+
+def run(args, profile=None):
+    """Harvest every job of the parsed arguments; returns the finished HarvestJobs"""
+    from http_cache import ResponseCache
+    from item_store import ItemStore
+    from rate_limiter import TokenBucketLimiter
+    from scheduler import job_matrix, run_jobs
+    from seen_set import SeenSet
+    from work_queue import WorkQueue
+
+    date_ranges, required_fields = check_args(args)
+    jobs = job_matrix(args.keywords, args.states, date_ranges, save_to=args.save_to)
+
+    print("=" * 60)
+    print("📰 CHRONICLING AMERICA - MULTI-QUERY SCHEDULER")
+    print("=" * 60)
+    print(f"📅 Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"🗂️  {len(jobs)} jobs: {', '.join(job.name for job in jobs)}")
+    print()
+
+    cache = None
+    if args.cache:
+        cache = ResponseCache(args.cache, ttl=args.cache_ttl_days * 24 * 3600)
+    item_store = ItemStore(args.item_store) if args.item_store else None
+    seen = SeenSet(args.seen_set, bloom=args.bloom) if args.seen_set else None
+    work_queue = None
+    if not args.journal_dir:
+        work_queue = WorkQueue(args.queue)
+        if args.resume:
+            work_queue.report()
+        else:
+            work_queue.reset()
+
+    metrics = None
+    if args.metrics_port:
+        from metrics import HarvestMetrics
+        metrics = HarvestMetrics()
+        metrics.serve(args.metrics_port, args.metrics_addr)
+    limiter = TokenBucketLimiter(rate=args.requests_per_minute / 60, burst=args.burst)
+    try:
+        jobs = run_jobs(jobs, limiter=limiter, max_connections=args.connections,
+                        per_job_concurrency=args.per_job_concurrency, target_chunk_size=args.chunk_size,
+                        extract=args.extract, required_fields=required_fields, cache=cache,
+                        item_store=item_store, seen=seen,
+                        journal_dir=args.journal_dir, work_queue=work_queue, parquet_root=args.parquet,
+                        decoder=args.json_decoder, skim_search=args.skim_search, base_url=args.base_url,
+                        http2=args.http2, keepalive_expiry=args.keepalive,
+                        metrics=metrics, profile=profile, progress_every=args.progress_every)
+    finally:
+        # Also after a crash: flush what the stores hold so --resume can use it
+        if cache is not None:
+            cache.report()
+            cache.close()
+        if item_store is not None:
+            item_store.report()
+            item_store.close()
+        if seen is not None:
+            seen.report()
+            seen.close()
+        if work_queue is not None:
+            work_queue.report()
+            work_queue.close()
+    return jobs
+
+
+def report(jobs, summary=False, plot_dir=None):
+    """Summary and plot stages; the only part that needs pandas/matplotlib"""
+    if not (summary or plot_dir):
+        return
+    from analysis import plot_newspapers, summarize
+
+    for job in jobs:
+        if not job.rows:
+            continue
+        print()
+        df = summarize(job.output)
+        if plot_dir:
+            path = plot_newspapers(df, os.path.join(plot_dir, f"{job.name}.png"))
+            print(f"📈 Chart saved to: {path}")
+
+
+def harvest_from_config(path, **overrides):
+    """Run the queries of a config file from Python; returns the finished HarvestJobs"""
+    args = parse_args(['--config', path])
+    vars(args).update(overrides)
+    return run(args)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parse_args(argv, parser)
+    from profiling import RunProfile, phase
+
+    try:
+        check_args(args)
+    except ValueError as e:  # unknown state or column, malformed date range, missing store
+        parser.error(str(e))
+    profile = RunProfile()
+    jobs = run(args, profile)
+    with phase(profile, 'summary'):
+        report(jobs, summary=args.summary, plot_dir=args.plot)
+    profile.finish()
+    print()
+    profile.report()
+    if args.profile:
+        profile.save(args.profile)
+    print(f"📅 Finished: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
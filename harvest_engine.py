@@ -0,0 +1,632 @@
+import asyncio
+import sys
+import time
+from collections import Counter
+
+import httpx
+
+from json_decoding import DECODE_ERRORS, get_decoder, search_page_decoder
+from profiling import span
+from rate_limiter import TokenBucketLimiter, parse_retry_after
+from records import PageRecord, RecordBatch
+from sinks import CSV_COLUMNS, CsvSink
+
+# ============================================================================
+# ASYNC HARVEST ENGINE
+# ============================================================================
+# Same search -> item metadata flow as the scripts, but with several requests
+# in flight at once. The shared TokenBucketLimiter still decides when a request
+# may *start*; concurrency only lets us overlap the round trips.
+
+LOC_ORIGIN = 'https://www.loc.gov'
+
+# get_json: a 200 whose body didn't decode; retried, then treated as a failed fetch
+UNDECODABLE = object()
+
+HEADERS = {
+    'User-Agent': 'Academic Research - Historical Analysis',
+    'Accept': 'application/json'
+}
+
+
+def https_url(url, origin=LOC_ORIGIN):
+    """loc.gov hands out http:// links; ask for https directly so the pooled
+    connection is reused instead of following a redirect onto a new one.
+    With another `origin` (e.g. mock_loc.py) loc.gov links are sent there."""
+    for prefix in ('http://www.loc.gov/', 'https://www.loc.gov/'):
+        if url.startswith(prefix):
+            return origin + url[len(prefix) - 1:]
+    return url
+
+
+def item_json_url(item_id):
+    """Add fo=json to an item/resource link"""
+    if 'fo=json' not in item_id:
+        item_id += '&fo=json' if '?' in item_id else '?fo=json'
+    return item_id
+
+
+def keep_result(result):
+    """Filter out collections, web pages and links to other platforms"""
+    original_format = result.get("original_format", "")
+    if ("collection" in original_format) or ("web page" in original_format):
+        return False
+    item = result.get("id") or ""
+    return item.startswith("http://www.loc.gov/item") or item.startswith("http://www.loc.gov/resource")
+
+
+def build_metadata_row(item_data):
+    """PageRecord with the fields safe_get_metadata extracted, or None if there is no 'item'"""
+    return PageRecord.from_item_json(item_data)
+
+
+class ConnectionStats:
+    """Requests vs. newly opened connections, counted from httpcore trace events"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self.http_versions = Counter()
+
+    async def trace(self, event_name, info):
+        if event_name == 'connection.connect_tcp.complete':
+            self.connections += 1
+        elif event_name == 'connection.start_tls.complete':
+            self.tls_handshakes += 1
+        elif event_name.endswith('.send_request_headers.started'):
+            self.requests += 1
+            self.http_versions[event_name.split('.', 1)[0]] += 1
+
+    @classmethod
+    def combined(cls, all_stats):
+        """One ConnectionStats summing several (e.g. every job's on a shared client)"""
+        total = cls()
+        for stats in all_stats:
+            total.requests += stats.requests
+            total.connections += stats.connections
+            total.tls_handshakes += stats.tls_handshakes
+            total.http_versions.update(stats.http_versions)
+        return total
+
+    @property
+    def reused(self):
+        return max(0, self.requests - self.connections)
+
+    def report(self):
+        print("🔌 CONNECTIONS:")
+        print(f"   Requests sent: {self.requests}")
+        print(f"   New connections: {self.connections} ({self.tls_handshakes} TLS handshakes)")
+        if self.requests:
+            print(f"   Reused: {self.reused} ({self.reused / self.requests:.0%} of requests)")
+        if self.http_versions:
+            versions = ', '.join(f"{name}: {count}" for name, count in sorted(self.http_versions.items()))
+            print(f"   Protocols: {versions}")
+
+
+def make_client(headers=None, timeout=30.0, max_connections=10, keepalive_expiry=30.0,
+                http2=False, transport=None):
+    """Pooled keep-alive AsyncClient shared by the search and metadata phases"""
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            print("⚠️  HTTP/2 needs the 'h2' package (pip install httpx[http2]); using HTTP/1.1")
+            http2 = False
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_connections,
+                          keepalive_expiry=keepalive_expiry)
+    return httpx.AsyncClient(headers=headers or HEADERS, timeout=timeout, limits=limits,
+                             http2=http2, follow_redirects=True, transport=transport)
+
+
+# Where each row field can be read from a search result, in order of preference
+SEARCH_RESULT_KEYS = {
+    'Newspaper Title': ('newspaper_title', 'partof_title'),
+    'Issue Date': ('date',),
+    'Page Number': ('page', 'number_page'),
+    'State': ('location_state',),
+    'City': ('location_city',),
+    'LCCN': ('number_lccn',),
+    # Not the lower-cased `contributor` facet: it would differ from item-mode CSVs
+    'Contributor': ('contributor_names',),
+    'Batch': ('batch',),
+}
+
+
+def row_from_search_result(result):
+    """Metadata row from a search result alone; returns (row, missing fields)"""
+    row = {}
+    missing = []
+    for field, keys in SEARCH_RESULT_KEYS.items():
+        key = next((key for key in keys if key in result), None)
+        if key is None:
+            missing.append(field)
+            row[field] = ''
+        else:
+            row[field] = result[key]
+    pdf = result.get('pdf') or next((resource['pdf'] for resource in result.get('resources') or []
+                                     if isinstance(resource, dict) and resource.get('pdf')), None)
+    row['PDF Link'] = pdf or ''
+    if not pdf:
+        missing.append('PDF Link')
+    return PageRecord.from_row(row), missing
+
+
+async def _aiter(iterable):
+    """Accept both plain and async iterables of item IDs"""
+    if hasattr(iterable, '__aiter__'):
+        async for value in iterable:
+            yield value
+    else:
+        for value in iterable:
+            yield value
+
+
+class Harvester:
+    """Concurrent search + metadata harvester on one pooled httpx.AsyncClient
+
+    Pass `client` to share a pool between harvesters; otherwise one is built
+    from the pool options and closed on exit.
+    """
+
+    def __init__(self, concurrency=4, limiter=None, page_size=100, timeout=30.0,
+                 max_retries=3, retry_wait=30.0, headers=None, transport=None,
+                 client=None, http2=False, max_connections=None, keepalive_expiry=30.0,
+                 name=None, extract='item', required_fields=None, cache=None,
+                 item_store=None, checkpoint=None, decoder=None, skim_search=False,
+                 base_url=None, metrics=None, profile=None, progress=None, seen=None):
+        self.concurrency = concurrency
+        self.limiter = limiter or TokenBucketLimiter()
+        self.page_size = page_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_wait = retry_wait
+        self.headers = headers or HEADERS
+        self.transport = transport
+        self.http2 = http2
+        self.max_connections = max_connections or concurrency + 1
+        self.keepalive_expiry = keepalive_expiry
+        self.client = client
+        self._owns_client = client is None
+        self.connections = ConnectionStats()
+        self.request_count = 0
+        self.name = name or 'harvest'
+        self.label = f"[{name}] " if name else ""
+        if extract not in ('item', 'search'):
+            raise ValueError(f"extract must be 'item' or 'search', not {extract!r}")
+        self.extract = extract
+        self.required_fields = set(required_fields or CSV_COLUMNS)
+        self.item_fetches = 0
+        self.search_only_rows = 0
+        self.cache = cache
+        self.item_store = item_store
+        self.checkpoint = checkpoint
+        self.decode = get_decoder(decoder)
+        # Search mode needs whole results; the item phase only reads id/original_format
+        self.decode_search = search_page_decoder(decoder, skim_search and extract == 'item')
+        # Where www.loc.gov requests go; a local stand-in server for benchmarks
+        self.origin = (base_url or LOC_ORIGIN).rstrip('/')
+        self.metrics = metrics
+        self.profile = profile
+        self.progress = progress
+        self.seen = seen
+
+    async def __aenter__(self):
+        if self._owns_client:
+            self.client = make_client(self.headers, self.timeout, self.max_connections,
+                                      self.keepalive_expiry, self.http2, self.transport)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._owns_client:
+            await self.client.aclose()
+            self.client = None
+
+    async def get_json(self, url, params=None, decode=None, phase=None):
+        """GET a JSON payload, retrying on 429 and network errors; None on failure
+
+        With a ResponseCache, fresh entries are returned without touching the
+        limiter and stale ones are revalidated with a conditional request.
+        `decode` turns the body bytes into the result (default: self.decode).
+        `phase` labels metrics and profile spans (default: 'search' or 'item'
+        from the URL).
+        """
+        decode = decode or self.decode
+        url = https_url(url, self.origin)
+        if params:
+            # httpx replaces the query string with `params`; merge like requests does
+            url = str(httpx.URL(url).copy_merge_params(params))
+        phase = phase or ('search' if '/collections/' in url else 'item')
+        if self.cache is not None:
+            with self._span('io', phase):
+                cached = self.cache.lookup(url)
+        else:
+            cached = None
+        if cached is not None and cached.fresh:
+            if self.metrics is not None:
+                self.metrics.cache_hits.labels(self.name, phase, 'http').inc()
+            data = self._decode(decode, cached.body, url, phase)
+            return None if data is UNDECODABLE else data
+        headers = cached.validators() if cached is not None else None
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self._send(url, headers, phase)
+            except httpx.HTTPError as e:
+                print(f"   ❌ {self.label}Request failed ({attempt + 1}/{self.max_retries + 1}): {e}")
+                await asyncio.sleep(self.retry_wait)
+                continue
+
+            if response.status_code == 429:
+                pause = self.limiter.record_rate_limited(
+                    parse_retry_after(response.headers.get('Retry-After')))
+                print(f"   🚨 {self.label}429 - Rate limit hit. Pausing {pause:.0f}s, "
+                      f"slowing to {self.limiter.requests_per_minute:.1f} req/min...")
+                continue
+
+            if response.status_code == 304 and cached is not None:
+                self.limiter.record_success()
+                with self._span('io', phase):
+                    self.cache.refresh(url)
+                data = self._decode(decode, cached.body, url, phase)
+                return None if data is UNDECODABLE else data
+
+            if response.status_code == 200 and 'json' in response.headers.get('content-type', ''):
+                self.limiter.record_success()
+                data = self._decode(decode, response.content, url, phase)
+                if data is UNDECODABLE:
+                    continue  # e.g. a truncated body: ask again
+                if self.cache is not None:
+                    with self._span('io', phase):
+                        self.cache.store(url, response.content, response.headers)
+                return data
+
+            print(f"   ❌ {self.label}HTTP {response.status_code} for {url[:80]}")
+            return None
+        return None
+
+    def _decode(self, decode, body, url, phase):
+        """decode(body), or UNDECODABLE (logged) if it isn't valid JSON"""
+        with self._span('parsing', phase):
+            try:
+                return decode(body)
+            except DECODE_ERRORS as e:
+                print(f"   ❌ {self.label}Invalid JSON from {url[:80]}: {str(e)[:80]}")
+                return UNDECODABLE
+
+    async def _send(self, url, headers, phase):
+        """Wait for the limiter, then GET; the wait and the round trip go to the metrics and profile"""
+        started = time.monotonic()
+        await self.limiter.acquire()
+        sent = time.monotonic()
+        self.request_count += 1
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.limiter_wait.labels(self.name, phase).observe(sent - started)
+            in_flight = metrics.in_flight.labels(self.name, phase)
+            in_flight.inc()
+        status = None
+        try:
+            response = await self.client.get(url, headers=headers,
+                                              extensions={'trace': self.connections.trace})
+            status = str(response.status_code)
+            return response
+        except httpx.HTTPError:
+            status = 'error'
+            raise
+        finally:
+            elapsed = time.monotonic() - sent
+            if metrics is not None:
+                in_flight.dec()
+                metrics.request_seconds.labels(self.name, phase).observe(elapsed)
+                if status is not None:
+                    metrics.requests.labels(self.name, phase, status).inc()
+            if self.profile is not None:
+                self.profile.record('limiter', phase, sent - started)
+                self.profile.record('network', phase, elapsed)
+            if self.progress is not None:
+                self.progress.waited(sent - started)
+
+    def _span(self, category, phase):
+        return span(self.profile, category, phase)
+
+    async def iter_results(self, search_url):
+        """Stream kept search results page by page, prefetching the next page
+
+        Follows pagination.next in a loop (no recursion) and starts the request
+        for page k+1 before page k's results are handed to the consumer, so
+        only two pages are ever held in memory.
+        """
+        exclude = ["loc.gov/item", "loc.gov/resource"]
+        if any(string in search_url for string in exclude):
+            raise NameError('Use a search URL, not item/resource URL')
+
+        start_url = search_url
+        resume = self.checkpoint.resume_state(search_url) if self.checkpoint is not None else None
+        if resume is not None:
+            # Items seen before the crash but never finished, then carry on
+            # paginating from the last recorded cursor
+            start_url, pending = resume
+            print(f"   ♻️  {self.label}Resuming: {len(pending)} unfinished items"
+                  + (", search complete" if start_url is None else ""))
+            for result in self._unseen(search_url, [{'id': item_id} for item_id in pending]):
+                result['_search'] = search_url
+                yield result
+            if start_url is None:
+                return
+
+        params = {"fo": "json", "c": self.page_size, "at": "results,pagination"}
+        page_task = asyncio.ensure_future(self.get_json(start_url, params, self.decode_search))
+        pages = 0
+        try:
+            while page_task is not None:
+                data = await page_task
+                page_task = None
+                if data is None:
+                    break
+                pages += 1
+                pagination = data.get("pagination") or {}
+                if pages == 1 and self.progress is not None and pagination.get("of") is not None:
+                    self.progress.add_expected(pagination["of"])
+                next_url = pagination.get("next")
+                if next_url:
+                    page_task = asyncio.ensure_future(self.get_json(next_url, params, self.decode_search))
+                found = data.get('results', [])
+                results = [result for result in found if keep_result(result)]
+                # `of` counts collections/web pages too; they are never fetched
+                self._not_expected(len(found) - len(results))
+                del data, found
+                results = self._unseen(search_url, results)
+                if self.checkpoint is not None:
+                    with self._span('io', 'search'):
+                        self.checkpoint.page_done(search_url, next_url, [result["id"] for result in results])
+                for result in results:
+                    # Which search found it: checkpoint rows are per (search, item)
+                    result['_search'] = search_url
+                    yield result
+                print(f"   📄 {self.label}Page {pages} collected")
+        finally:
+            if page_task is not None:
+                page_task.cancel()
+
+    def _unseen(self, search_url, results):
+        """Drop results this job already found in another chunk, before any item request"""
+        if self.seen is None:
+            return results
+        with self._span('io', 'search'):
+            unseen = self.seen.filter(search_url, results, self.name)
+        self._not_expected(len(results) - len(unseen))
+        return unseen
+
+    def _not_expected(self, dropped):
+        """Take `dropped` results back out of the progress's expected count"""
+        if dropped and self.progress is not None and self.progress.expected is not None:
+            self.progress.add_expected(-dropped)
+
+    async def iter_item_ids(self, search_url):
+        """Stream item/resource links for a search"""
+        async for result in self.iter_results(search_url):
+            yield result["id"]
+
+    async def get_item_ids(self, search_url):
+        """Collect every item/resource link for a search into a list"""
+        return [item_id async for item_id in self.iter_item_ids(search_url)]
+
+    async def get_metadata(self, item_id, check_store=True):
+        """Metadata row for one item: from the ItemStore if known, else from its JSON
+
+        check_store=False skips the store lookup for callers that just made it.
+        """
+        row = self._stored_row(item_id) if check_store else None
+        if row is not None:
+            return row
+        self.item_fetches += 1
+        item_data = await self.get_json(item_json_url(item_id))
+        if item_data is None:
+            return None
+        with self._span('parsing', 'item'):
+            row = build_metadata_row(item_data)
+        if row is not None and self.item_store is not None:
+            with self._span('io', 'item'):
+                self.item_store.put(item_id, row, item_data)
+        return row
+
+    def _stored_row(self, item_id):
+        """Row from the ItemStore, or None if there is no store or the item is new"""
+        if self.item_store is None:
+            return None
+        with self._span('io', 'item'):
+            row = self.item_store.get(item_id)
+        if row is None:
+            return None
+        if self.metrics is not None:
+            self.metrics.cache_hits.labels(self.name, 'item', 'item_store').inc()
+        return PageRecord.from_row(row)
+
+    async def get_metadata_for_item(self, result):
+        return await self.get_metadata(result['id'])
+
+    async def get_metadata_for_result(self, result):
+        """Row straight from the search result; fetch the item only for missing fields"""
+        row = self._stored_row(result['id'])
+        if row is not None:
+            return row
+        with self._span('parsing', 'search'):
+            row, missing = row_from_search_result(result)
+        missing = [field for field in missing if field in self.required_fields]
+        if not missing:
+            self.search_only_rows += 1
+            return row
+        item_row = await self.get_metadata(result['id'], check_store=False)
+        if item_row is None:
+            return None
+        for field in missing:
+            row[field] = item_row[field]
+        row['Year'] = item_row['Year'] or row['Year']
+        return row
+
+    async def iter_metadata(self, item_ids, fetch=None):
+        """Yield metadata rows as they complete, keeping up to `concurrency` fetches in flight
+
+        `fetch` turns one element of `item_ids` into a row (default: item ID -> item JSON).
+        """
+        fetch = fetch or self.get_metadata
+        pending = set()
+        ids = _aiter(item_ids).__aiter__()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self.concurrency:
+                    try:
+                        item_id = await ids.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    pending.add(asyncio.ensure_future(fetch(item_id)))
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    row = task.result()
+                    if self.progress is not None:
+                        self.progress.item_done(failed=row is None)
+                    if row is not None:
+                        if self.metrics is not None:
+                            self.metrics.items.labels(self.name, self.extract).inc()
+                        yield row
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_results_many(self, search_urls, buffer=200):
+        """Paginate several searches (e.g. date chunks) at once into one result stream
+
+        The bounded queue keeps a fast chunk from running far ahead of the
+        metadata fetches.
+        """
+        queue = asyncio.Queue(maxsize=buffer)
+        done = object()
+
+        async def pump(url):
+            try:
+                async for result in self.iter_results(url):
+                    await queue.put(result)
+            except Exception as e:
+                print(f"   ❌ {self.label}Search failed for {url[:80]}: {e}")
+            await queue.put(done)
+
+        pumps = [asyncio.ensure_future(pump(url)) for url in search_urls]
+        remaining = len(pumps)
+        try:
+            while remaining:
+                result = await queue.get()
+                if result is done:
+                    remaining -= 1
+                else:
+                    yield result
+        finally:
+            for task in pumps:
+                task.cancel()
+
+    async def harvest(self, search_url):
+        """Yield metadata rows while results are still streaming in from the search
+
+        `search_url` may also be a list of URLs, which are paginated in parallel.
+        With extract='search' rows are built from the search results and item
+        JSON is only requested for fields the results lack.
+        """
+        if isinstance(search_url, str):
+            results = self.iter_results(search_url)
+        else:
+            results = self.iter_results_many(search_url)
+        if self.extract == 'search':
+            fetch = self.get_metadata_for_result
+        else:
+            fetch = self.get_metadata_for_item
+        if self.seen is not None:
+            fetch = self._remembered(fetch)
+        if self.checkpoint is not None:
+            for url in ([search_url] if isinstance(search_url, str) else search_url):
+                for row in self.checkpoint.done_rows(url):
+                    if self.progress is not None:
+                        self.progress.add_restored(1)
+                    yield PageRecord.from_row(row)
+            fetch = self._checkpointed(fetch)
+        async for row in self.iter_metadata(results, fetch):
+            yield row
+
+    def _checkpointed(self, fetch):
+        """Wrap a fetch so every item's outcome is recorded in the checkpoint"""
+        async def fetch_and_record(result):
+            with self._span('io', 'item'):
+                self.checkpoint.item_started(result['_search'], result['id'])
+            row = await fetch(result)
+            with self._span('io', 'item'):
+                if row is None:
+                    self.checkpoint.item_failed(result['_search'], result['id'])
+                else:
+                    self.checkpoint.item_done(result['_search'], result['id'], row)
+            return row
+        return fetch_and_record
+
+    def _remembered(self, fetch):
+        """Wrap a fetch so a page another job is fetching is waited for, and finished pages are remembered
+
+        The wait is another job's request, so it is left out of the spans;
+        the fetch then finds that job's row in the ItemStore.
+        """
+        async def fetch_once(result):
+            await self.seen.claim(result['id'], self.name)
+            row = await fetch(result)
+            with self._span('io', 'item'):
+                if row is None:
+                    self.seen.item_failed(result['id'], self.name)
+                else:
+                    self.seen.item_done(result['id'], result.get('_search'))
+            return row
+        return fetch_once
+
+    def report(self):
+        print("📥 METADATA:")
+        print(f"   Item JSON requests: {self.item_fetches}")
+        if self.extract == 'search':
+            print(f"   Rows built from search results only: {self.search_only_rows}")
+        print(f"   Total requests: {self.request_count}")
+        self.connections.report()
+        if self.cache is not None:
+            self.cache.report()
+        if self.item_store is not None:
+            self.item_store.report()
+
+
+async def collect(search_url, **harvester_options):
+    async with Harvester(**harvester_options) as harvester:
+        rows = RecordBatch()
+        async for row in harvester.harvest(search_url):
+            rows.append(row)
+    harvester.report()
+    return rows
+
+
+def harvest(search_url, **harvester_options):
+    """Blocking wrapper: run the whole harvest and return its rows as a RecordBatch"""
+    return asyncio.run(collect(search_url, **harvester_options))
+
+
+async def harvest_to_csv(search_url, csv_path, **harvester_options):
+    """Stream rows straight into a CSV; returns the number of rows written"""
+    async with Harvester(**harvester_options) as harvester:
+        with CsvSink(csv_path) as sink:
+            async for row in harvester.harvest(search_url):
+                sink.write(row)
+    harvester.report()
+    return sink.rows
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+if __name__ == '__main__':
+    from harvest import main
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import os
+import sqlite3
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# ============================================================================
+# PERSISTENT HTTP RESPONSE CACHE (SQLite)
+# ============================================================================
+# Historical newspaper metadata almost never changes, so a rerun should not
+# have to go back to loc.gov for every page and item:
+#   - keyed by canonical URL (https, lowercase host, sorted query)
+#   - fresh entries (younger than `ttl`) are served without any request,
+#     so they cost no rate budget at all
+#   - stale entries are revalidated with If-None-Match / If-Modified-Since
+#     when the server sent an ETag / Last-Modified; a 304 refreshes them
+#   - once the stored bodies exceed `max_bytes`, the least recently used
+#     entries are evicted
+
+DEFAULT_PATH = os.path.join('cache', 'http_cache.sqlite')
+
+
+def canonical_url(url):
+    """Same resource -> same key, whatever the param order or scheme"""
+    parts = urlsplit(url)
+    scheme = 'https' if parts.netloc.lower().endswith('loc.gov') else parts.scheme
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+class CachedResponse:
+    def __init__(self, body, content_type, etag, last_modified, fetched_at, ttl):
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.fresh = ttl is None or time.time() - fetched_at < ttl
+
+    def validators(self):
+        """Conditional request headers for revalidating this entry"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """SQLite-backed response cache with TTL, LRU size limit and revalidation"""
+
+    def __init__(self, path=DEFAULT_PATH, ttl=30 * 24 * 3600, max_bytes=2 * 1024 ** 3):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('''CREATE TABLE IF NOT EXISTS responses (
+                               url TEXT PRIMARY KEY,
+                               body BLOB NOT NULL,
+                               content_type TEXT,
+                               etag TEXT,
+                               last_modified TEXT,
+                               fetched_at REAL NOT NULL,
+                               accessed_at REAL NOT NULL,
+                               size INTEGER NOT NULL)''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)')
+        self.total_bytes = self.db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stored = 0
+        self.evicted = 0
+
+    def lookup(self, url):
+        """Cached entry for `url` (fresh or stale), or None"""
+        key = canonical_url(url)
+        row = self.db.execute('SELECT body, content_type, etag, last_modified, fetched_at '
+                              'FROM responses WHERE url = ?', (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.db.execute('UPDATE responses SET accessed_at = ? WHERE url = ?', (time.time(), key))
+        entry = CachedResponse(*row, ttl=self.ttl)
+        if entry.fresh:
+            self.hits += 1
+        return entry
+
+    def store(self, url, body, headers):
+        """Save a 200 response body with its validators"""
+        key = canonical_url(url)
+        now = time.time()
+        old = self.db.execute('SELECT size FROM responses WHERE url = ?', (key,)).fetchone()
+        self.db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                        (key, body, headers.get('content-type'), headers.get('etag'),
+                         headers.get('last-modified'), now, now, len(body)))
+        self.total_bytes += len(body) - (old[0] if old else 0)
+        self.stored += 1
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def refresh(self, url):
+        """A 304 confirmed the stale entry; restart its TTL"""
+        now = time.time()
+        self.db.execute('UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?',
+                        (now, now, canonical_url(url)))
+        self.revalidated += 1
+
+    def evict(self):
+        """Drop least recently used entries until the cache is back under 90% of max_bytes"""
+        target = self.max_bytes * 0.9
+        rows = self.db.execute('SELECT url, size FROM responses ORDER BY accessed_at')
+        doomed = []
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            doomed.append((key,))
+            self.total_bytes -= size
+        self.db.executemany('DELETE FROM responses WHERE url = ?', doomed)
+        self.evicted += len(doomed)
+
+    def close(self):
+        self.db.close()
+
+    def report(self):
+        print("🗄️  HTTP CACHE:")
+        print(f"   Fresh hits: {self.hits}, revalidated (304): {self.revalidated}, misses: {self.misses}")
+        print(f"   Stored: {self.stored}, evicted: {self.evicted}, "
+              f"size: {self.total_bytes / 1024 ** 2:.1f} MB")
@@ -0,0 +1,88 @@
+import json
+import os
+import re
+import sqlite3
+import time
+
+# ============================================================================
+# CROSS-QUERY ITEM METADATA STORE (SQLite)
+# ============================================================================
+# Queries overlap (WV 1870-1874 vs 1872-1874, national vs. state), but a
+# newspaper page's metadata is the same whichever search found it. The store
+# keeps the extracted row and the raw item JSON per page, keyed by a
+# normalized item ID, so the metadata phase only fetches pages it has never
+# seen - in this run or any earlier one.
+
+DEFAULT_PATH = os.path.join('cache', 'items.sqlite')
+
+
+def normalize_item_id(item_id):
+    """One key per newspaper page, however the search spelled its link
+
+    'http://www.loc.gov/resource/sn83030313/1873-01-31/ed-1/?sp=4&q=coolie&fo=json'
+    -> 'resource/sn83030313/1873-01-31/ed-1/?sp=4'
+    Query/highlight parameters (q, st, r, fo) differ between searches and are
+    dropped; the page number (sp) identifies the page and is kept.
+    """
+    item_id = re.sub(r'^https?://(www\.)?loc\.gov/', '', item_id.strip())
+    path, _, query = item_id.partition('?')
+    if not path.endswith('/'):
+        path += '/'
+    page = re.search(r'(?:^|&)sp=(\d+)', query)
+    return f"{path}?sp={page.group(1)}" if page else path
+
+
+class ItemStore:
+    """Extracted metadata rows + raw item JSON, shared by every harvest"""
+
+    def __init__(self, path=DEFAULT_PATH, keep_raw=True):
+        self.path = path
+        self.keep_raw = keep_raw
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('''CREATE TABLE IF NOT EXISTS items (
+                               item_key TEXT PRIMARY KEY,
+                               item_id TEXT NOT NULL,
+                               row TEXT NOT NULL,
+                               raw TEXT,
+                               stored_at REAL NOT NULL)''')
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+
+    def get(self, item_id):
+        """Stored metadata row for an item, or None"""
+        found = self.db.execute('SELECT row FROM items WHERE item_key = ?',
+                                (normalize_item_id(item_id),)).fetchone()
+        if found is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(found[0])
+
+    def get_raw(self, item_id):
+        found = self.db.execute('SELECT raw FROM items WHERE item_key = ?',
+                                (normalize_item_id(item_id),)).fetchone()
+        return json.loads(found[0]) if found and found[0] else None
+
+    def put(self, item_id, row, raw=None):
+        self.db.execute('INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?)',
+                        (normalize_item_id(item_id), item_id, json.dumps(dict(row)),
+                         json.dumps(raw) if raw is not None and self.keep_raw else None,
+                         time.time()))
+        self.stored += 1
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM items').fetchone()[0]
+
+    def close(self):
+        self.db.close()
+
+    def report(self):
+        lookups = self.hits + self.misses
+        print("📚 ITEM STORE:")
+        print(f"   Hits: {self.hits}, misses: {self.misses}"
+              + (f" ({self.hits / lookups:.0%} served locally)" if lookups else ""))
+        print(f"   Newly stored: {self.stored}, total items: {len(self)}")
@@ -0,0 +1,164 @@
+import json
+import sys
+import time
+import tracemalloc
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# ============================================================================
+# PLUGGABLE JSON DECODING
+# ============================================================================
+# Every search page and item payload used to go through response.json()
+# (stdlib json). Decoders are picked by name - orjson when it is installed,
+# stdlib json otherwise - and get_json() hands them the raw response bytes.
+#
+# Search pages are the big payloads (c=100 results, each with OCR snippets,
+# subjects, image and resource lists), yet the item phase only needs
+# results[*].id and original_format plus the pagination block.
+# skim_search_page() (needs ijson) streams just those out of the bytes, one
+# result at a time. orjson's full decode is still faster per page; skimming
+# is for memory: a c=1000 page peaks at ~0.7 MB instead of ~6.4 MB.
+
+DECODERS = {'json': json.loads}
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+
+DEFAULT_DECODER = 'orjson' if orjson is not None else 'json'
+
+# What a decoder raises for a body that isn't valid JSON (orjson's and json's are ValueErrors)
+DECODE_ERRORS = (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
+
+# The parts of a search result the item phase reads (keep_result, checkpoints)
+SKIM_FIELDS = ('id', 'original_format')
+
+
+def get_decoder(decoder=None):
+    """loads() function for a decoder name ('orjson', 'json'), a callable, or None for the fastest installed"""
+    if callable(decoder):
+        return decoder
+    name = decoder or DEFAULT_DECODER
+    if name not in DECODERS:
+        raise ValueError(f"JSON decoder {name!r} is not available; installed: {', '.join(DECODERS)}")
+    return DECODERS[name]
+
+
+def skim_search_page(body, fields=SKIM_FIELDS):
+    """{'results': [{field: ...}], 'pagination': {...}} from a search page, streamed with ijson
+
+    One pass over the parse events: results are built one at a time and cut
+    down to `fields`, so a c=1000 page never exists as a full object tree.
+    """
+    wanted = {f'results.item.{field}': field for field in fields}
+    results, pagination = [], {}
+    builder = target = None  # the list/object value being assembled, and its prefix
+    for prefix, event, value in ijson.parse(body):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == target and event in ('end_map', 'end_array'):
+                if target == 'pagination':
+                    pagination = builder.value
+                else:
+                    results[-1][wanted[target]] = builder.value
+                builder = None
+        elif prefix == 'results.item' and event == 'start_map':
+            results.append({})
+        elif prefix in wanted or prefix == 'pagination':
+            if event in ('start_map', 'start_array'):
+                builder, target = ijson.ObjectBuilder(), prefix
+                builder.event(event, value)
+            elif prefix == 'pagination':
+                pagination = value
+            elif event != 'map_key':
+                results[-1][wanted[prefix]] = value
+    return {'results': results, 'pagination': pagination}
+
+
+def search_page_decoder(decoder=None, skim=False):
+    """Decoder for search pages in the item phase: skim_search_page() if `skim`, else `decoder`"""
+    if not skim:
+        return get_decoder(decoder)
+    if ijson is None:
+        raise ImportError("Skimming search pages needs ijson: pip install ijson")
+    return skim_search_page
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def sample_search_page(results=100):
+    """Search page shaped like a loc.gov ?fo=json Chronicling America result page"""
+    words = 'coolie labor trade ship passage contract china cuba peru steamer wages emigration'.split()
+    page = {'results': [], 'pagination': {'current': 1, 'next': 'https://www.loc.gov/collections/'
+                                          'chronicling-america/?sp=2&fo=json', 'of': 1648,
+                                          'perpage': results, 'total': 17}}
+    for i in range(results):
+        lccn = f'sn8303{i % 40:04d}'
+        page['results'].append({
+            'access_restricted': False,
+            'aka': [f'http://www.loc.gov/item/{lccn}/1873-01-{i % 28 + 1:02d}/ed-1/'],
+            'campaigns': [],
+            'contributor': ['library of congress, washington, dc'],
+            'date': f'1873-01-{i % 28 + 1:02d}',
+            'dates': [f'1873-01-{i % 28 + 1:02d}'],
+            'description': [' '.join(words[(i + j) % len(words)] for j in range(60)) for _ in range(3)],
+            'digitized': True,
+            'group': ['chronicling-america'],
+            'id': f'http://www.loc.gov/resource/{lccn}/1873-01-{i % 28 + 1:02d}/ed-1/?sp={i % 8 + 1}&q=coolie',
+            'image_url': [f'https://tile.loc.gov/image-services/iiif/{lccn}-{i}/full/pct:{p}/0/default.jpg'
+                          for p in (6.25, 12.5, 25, 50)],
+            'index': i + 1,
+            'language': ['english'],
+            'location_city': ['new york'],
+            'location_country': ['united states'],
+            'location_state': ['new york'],
+            'number_lccn': [lccn],
+            'number_page': [str(i % 8 + 1)],
+            'online_format': ['image', 'pdf'],
+            'original_format': ['newspaper'],
+            'partof': ['chronicling america', 'new york herald'],
+            'partof_title': ['The New York herald.'],
+            'resources': [{'files': 1, 'pdf': f'https://tile.loc.gov/storage-services/{lccn}/{i:04d}.pdf',
+                           'url': f'https://www.loc.gov/resource/{lccn}/'}],
+            'subject': ['new york (n.y.)--newspapers', 'new york county (n.y.)--newspapers'],
+            'title': 'Image 4 of The New York herald (New York [N.Y.]), January 31, 1873',
+            'type': ['newspaper'],
+            'url': f'https://www.loc.gov/resource/{lccn}/1873-01-31/ed-1/?sp=4&q=coolie',
+        })
+    return json.dumps(page).encode()
+
+
+def benchmark_decoders(pages=200, results=100):
+    """Time and peak memory of each decoding strategy on `pages` search pages of `results` results"""
+    body = sample_search_page(results)
+    strategies = {f'{name}.loads': loads for name, loads in DECODERS.items()}
+    if ijson is not None:
+        strategies[f'ijson skim ({ijson.backend})'] = skim_search_page
+    print(f"🧩 SEARCH PAGE DECODING ({pages} pages x {results} results, {len(body) / 1024:.0f} KB each):")
+    timings = {}
+    for name, decode in strategies.items():
+        start = time.perf_counter()
+        for _ in range(pages):
+            data = decode(body)
+        seconds = (time.perf_counter() - start) / pages
+        del data
+        tracemalloc.start()
+        data = decode(body)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        timings[name] = (seconds, peak)
+        print(f"   {name}: {seconds * 1000:.2f} ms/page, peak {peak / 1024 ** 2:.1f} MB "
+              f"({len(data['results'])} ids)")
+    return timings
+
+
+if __name__ == "__main__":
+    benchmark_decoders(*(int(arg) for arg in sys.argv[1:3]))
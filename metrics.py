@@ -0,0 +1,58 @@
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+# ============================================================================
+# PROMETHEUS METRICS
+# ============================================================================
+# Optional live view of a long harvest (harvest.py --metrics-port 9108):
+#   harvest_requests_total{query, phase, status}   responses; status 'error'
+#                                                  for network failures
+#   harvest_request_seconds{query, phase}          request round trips
+#   harvest_in_flight_requests{query, phase}       requests awaiting a response
+#   harvest_limiter_wait_seconds{query, phase}     time spent waiting for a token
+#   harvest_cache_hits_total{query, phase, store}  answered by the response cache
+#                                                  ('http') or item store
+#   harvest_items_total{query, phase}              metadata rows extracted
+#   harvest_rows_written_total{query, sink}        rows written per sink
+# `query` is the job name (coolie_WV_1872_1874); `phase` is plan (chunk
+# probes), search (result pages) or item (item JSON).
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+WAIT_BUCKETS = (0, 0.1, 0.5, 1, 2, 5, 10, 30, 60, 120, 300, 600)
+
+
+class HarvestMetrics:
+    """prometheus_client collectors for the harvest engine, on their own registry"""
+
+    def __init__(self, registry=None):
+        if prometheus_client is None:
+            raise ImportError("Metrics need prometheus_client: pip install prometheus_client")
+        from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+        self.registry = registry or CollectorRegistry()
+        self.requests = Counter('harvest_requests', 'HTTP responses by status',
+                                ['query', 'phase', 'status'], registry=self.registry)
+        self.request_seconds = Histogram('harvest_request_seconds', 'Request round-trip time',
+                                         ['query', 'phase'], buckets=LATENCY_BUCKETS,
+                                         registry=self.registry)
+        self.in_flight = Gauge('harvest_in_flight_requests', 'Requests awaiting a response',
+                               ['query', 'phase'], registry=self.registry)
+        self.limiter_wait = Histogram('harvest_limiter_wait_seconds', 'Wait for a rate-limiter token',
+                                      ['query', 'phase'], buckets=WAIT_BUCKETS, registry=self.registry)
+        self.cache_hits = Counter('harvest_cache_hits', 'Responses served without a request',
+                                  ['query', 'phase', 'store'], registry=self.registry)
+        self.items = Counter('harvest_items', 'Metadata rows extracted',
+                             ['query', 'phase'], registry=self.registry)
+        self.rows_written = Counter('harvest_rows_written', 'Rows written to a sink',
+                                    ['query', 'sink'], registry=self.registry)
+
+    def serve(self, port, addr='127.0.0.1'):
+        """Expose /metrics on `port` from a background thread, to local clients by default"""
+        prometheus_client.start_http_server(port, addr, registry=self.registry)
+        print(f"📈 Metrics on http://{addr}:{port}/metrics")
+
+    def render(self):
+        """Current metrics in the Prometheus text format"""
+        return prometheus_client.generate_latest(self.registry).decode()
@@ -0,0 +1,419 @@
+import argparse
+import glob
+import json
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from records import PageRecord
+
+# ============================================================================
+# LOCAL STAND-IN FOR THE LOC.GOV API
+# ============================================================================
+# Serves the two endpoints a harvest uses, on localhost, from fixtures:
+#   /collections/chronicling-america/?qs=...&location_state=...&start_date=...
+#       search pages filtered by keyword/state/date, paginated with sp/c
+#   /resource/<lccn>/<date>/ed-1/?sp=<page>&fo=json
+#       the item JSON for one page
+# Results and `next` links carry www.loc.gov URLs like the real API; the
+# engine sends them here when started with base_url (harvest.py --base-url).
+#
+# Fixtures come from the output CSVs, from a ResponseCache recorded during a
+# real run (item and search JSON replayed as recorded), or are synthesized
+# in any number. Latency, page sizes and 429s (random, or from a per-minute
+# budget with Retry-After) are configurable, so throughput can be measured
+# reproducibly without the network.
+#
+# Search results built from CSV rows or synthesized carry what loc.gov's do
+# (see json_decoding.sample_search_page): the lower-cased `contributor` facet
+# but no `contributor_names` and no `batch`. Those two columns always need
+# the item JSON unless a harvest allows them to be missing
+# (--allow-missing Contributor Batch).
+
+SEARCH_PATH = '/collections/chronicling-america/'
+LOC_ORIGIN = 'https://www.loc.gov'
+
+
+class Fixture:
+    """One newspaper page: its search result and its item JSON"""
+
+    __slots__ = ('id', 'keyword', 'state', 'date', 'result', 'item')
+
+    def __init__(self, id, keyword, state, date, result, item):
+        self.id = id
+        self.keyword = keyword
+        self.state = state
+        self.date = date
+        self.result = result
+        self.item = item
+
+    @property
+    def key(self):
+        return item_key(self.id)
+
+    @classmethod
+    def from_record(cls, record, keyword=None):
+        """Search result and item JSON in the loc.gov shapes, built from a PageRecord
+
+        Like loc.gov's, the search result has no contributor_names or batch.
+        """
+        date = str(record.issue_date or '')[:10]
+        page = record.page or 1
+        lccn = record.lccn or 'sn00000000'
+        item_id = f"http://www.loc.gov/resource/{lccn}/{date}/ed-1/?sp={page}"
+        if keyword:
+            item_id += f"&q={keyword}"
+        listed = lambda value: [value] if value else []  # noqa: E731
+        result = {
+            'id': item_id,
+            'original_format': ['newspaper'],
+            'date': date,
+            'partof_title': listed(record.title),
+            'location_state': listed(record.state),
+            'location_city': listed(record.city),
+            'number_lccn': listed(lccn),
+            'number_page': [str(page)],
+            'contributor': listed(record.contributor and record.contributor.lower()),
+            'resources': [{'pdf': record.pdf}] if record.pdf else [],
+            'url': item_id.replace('http://', 'https://', 1),
+        }
+        item = {
+            'item': {
+                'newspaper_title': listed(record.title),
+                'date': date,
+                'location_state': listed(record.state),
+                'location_city': listed(record.city),
+                'number_lccn': listed(lccn),
+                'contributor_names': listed(record.contributor),
+                'batch': listed(record.batch),
+            },
+            'pagination': {'current': page},
+            'resource': {'pdf': record.pdf},
+        }
+        return cls(item_id, keyword, (record.state or '').lower(), date, result, item)
+
+
+def item_key(url):
+    """Item/resource path plus its page (sp) - how requests are matched to fixtures"""
+    parts = urlsplit(url)
+    page = parse_qs(parts.query).get('sp', [''])[0]
+    return f"{parts.path.rstrip('/')}/|{page}"
+
+
+class Fixtures:
+    """Searchable set of page fixtures, de-duplicated by item"""
+
+    def __init__(self, fixtures=()):
+        self.by_key = {}
+        for fixture in fixtures:
+            self.by_key.setdefault(fixture.key, fixture)
+        self.ordered = sorted(self.by_key.values(), key=lambda fixture: (fixture.date, fixture.id))
+
+    def __len__(self):
+        return len(self.ordered)
+
+    def item(self, url):
+        return self.by_key.get(item_key(url))
+
+    def search(self, keyword=None, state=None, start_date=None, end_date=None):
+        """Fixtures matching a search, in a stable (date, id) order"""
+        state = state.replace('+', ' ').lower() if state else None
+        keyword = keyword.lower() if keyword else None
+        return [fixture for fixture in self.ordered
+                if (not keyword or not fixture.keyword or fixture.keyword == keyword)
+                and (not state or fixture.state == state)
+                and (not start_date or fixture.date >= start_date)
+                and (not end_date or fixture.date <= end_date)]
+
+    @classmethod
+    def from_csv(cls, paths):
+        """Fixtures from output CSVs; the keyword is the file name up to the first '_'"""
+        from pandas.errors import EmptyDataError
+
+        from normalize import load_csv
+
+        fixtures = []
+        for path in paths:
+            keyword = os.path.basename(path).split('_', 1)[0].lower()
+            try:
+                df = load_csv(path)
+            except EmptyDataError:  # runs that found nothing left a bare newline
+                continue
+            if 'Issue Date' in df.columns:
+                df['Issue Date'] = df['Issue Date'].dt.strftime('%Y-%m-%d')
+            for row in df.astype(object).where(df.notna(), None).to_dict('records'):
+                record = PageRecord.from_row(row)
+                if record.issue_date:
+                    fixtures.append(Fixture.from_record(record, keyword))
+        return cls(fixtures)
+
+    @classmethod
+    def from_cache(cls, path):
+        """Replay item JSON recorded in a ResponseCache; recorded search results are reused where present"""
+        db = sqlite3.connect(path)
+        results = {}
+        items = []
+        for url, body in db.execute('SELECT url, body FROM responses'):
+            data = json.loads(body)
+            if SEARCH_PATH in url:
+                for result in data.get('results') or []:
+                    if result.get('id'):
+                        results[item_key(result['id'])] = result
+            elif '/resource/' in url or '/item/' in url:
+                items.append((url, data))
+        db.close()
+
+        fixtures = []
+        for url, data in items:
+            record = PageRecord.from_item_json(data)
+            if record is None or not record.issue_date:
+                continue
+            query = parse_qs(urlsplit(url).query)
+            fixture = Fixture.from_record(record, (query.get('q') or [None])[0])
+            recorded = results.get(item_key(url))
+            if recorded is not None:
+                fixture.id = recorded['id']
+                fixture.result = recorded
+            fixture.item = data
+            fixtures.append(fixture)
+        return cls(fixtures)
+
+    @classmethod
+    def synthetic(cls, count, keyword='coolie', states=('new york', 'west virginia'),
+                  start_year=1870, years=5):
+        """`count` made-up pages spread over `states` and `years` years"""
+        titles = {state: f'The {state.title()} daily herald.' for state in states}
+        fixtures = []
+        for i in range(count):
+            state = states[i % len(states)]
+            record = PageRecord(title=titles[state],
+                                issue_date=f'{start_year + i % years}-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+                                page=i % 8 + 1, lccn=f'sn{83000000 + i // 8:08d}', city=state,
+                                state=state, contributor='Library of Congress, Washington, DC',
+                                batch=f'dlc_batch{i % 20}_ver01',
+                                pdf=f'https://tile.loc.gov/storage-services/service/ndnp/dlc/{i:09d}.pdf')
+            fixtures.append(Fixture.from_record(record, keyword))
+        return cls(fixtures)
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class MockLocServer:
+    """loc.gov search + item endpoints on localhost, in a background thread
+
+        with MockLocServer(Fixtures.from_csv(paths), latency=0.05) as server:
+            run_jobs(jobs, base_url=server.base_url)
+    """
+
+    def __init__(self, fixtures, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 page_size=100, max_page_size=1000, error_rate=0.0,
+                 requests_per_minute=None, retry_after=1, seed=0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.error_rate = error_rate
+        self.requests_per_minute = requests_per_minute
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.recent = deque()
+        self.searches = {}
+        self.counts = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.mock = self
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _throttled(self):
+        """Seconds the client must wait, if this request is to be answered with a 429"""
+        with self._lock:
+            if self.error_rate and self.random.random() < self.error_rate:
+                return self.retry_after
+            if self.requests_per_minute:
+                now = time.monotonic()
+                while self.recent and now - self.recent[0] >= 60:
+                    self.recent.popleft()
+                if len(self.recent) >= self.requests_per_minute:
+                    return max(self.retry_after, math.ceil(60 - (now - self.recent[0])))
+                self.recent.append(now)
+            return None
+
+    def _delay(self):
+        with self._lock:
+            spread = self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency * (1 + spread))
+
+    def respond(self, path, query):
+        """(status, headers, body bytes) for one GET"""
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        route = 'search' if path.startswith(SEARCH_PATH) else 'item'
+        wait = self._throttled()
+        if wait is not None:
+            return self._count(route, 429, {'Retry-After': str(wait)}, {'status': 429})
+        if route == 'search':
+            return self._count(route, 200, {}, self.search_page(query))
+        fixture = self.fixtures.item(f"{path}?{query}")
+        if fixture is None:
+            return self._count(route, 404, {}, {'status': 404})
+        return self._count(route, 200, {}, fixture.item)
+
+    def _count(self, route, status, headers, payload):
+        body = json.dumps(payload).encode()
+        with self._lock:
+            self.counts[route, status] += 1
+            self.bytes_sent += len(body)
+        return status, headers, body
+
+    def search_page(self, query):
+        """Search page payload for a query string, paginated like loc.gov"""
+        params = parse_qs(query)
+        get = lambda name: (params.get(name) or [None])[0]  # noqa: E731
+        search = (get('qs') or get('q'), get('location_state'), get('start_date'), get('end_date'))
+        with self._lock:
+            matches = self.searches.get(search)
+        if matches is None:
+            matches = self.fixtures.search(*search)
+            with self._lock:
+                self.searches[search] = matches
+        per_page = min(int(get('c') or self.page_size), self.max_page_size)
+        pages = math.ceil(len(matches) / per_page)
+        current = int(get('sp') or 1)
+        first = (current - 1) * per_page
+
+        def page_url(number):
+            return f"{LOC_ORIGIN}{SEARCH_PATH}?{urlencode({**params, 'sp': [number]}, doseq=True)}"
+
+        payload = {
+            'results': [fixture.result for fixture in matches[first:first + per_page]],
+            'pagination': {
+                'current': current,
+                'from': min(first + 1, len(matches)),
+                'to': min(first + per_page, len(matches)),
+                'of': len(matches),
+                'perpage': per_page,
+                'total': pages,
+                'previous': page_url(current - 1) if current > 1 else None,
+                'next': page_url(current + 1) if current < pages else None,
+            },
+        }
+        fields = get('at')
+        if fields:
+            payload = {key: value for key, value in payload.items() if key in fields.split(',')}
+        return payload
+
+    def report(self):
+        print("🧪 MOCK LOC.GOV:")
+        print(f"   Fixtures: {len(self.fixtures)}, sent {self.bytes_sent / 1024 ** 2:.1f} MB")
+        for (route, status), count in sorted(self.counts.items()):
+            print(f"   {route} {status}: {count}")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like www.loc.gov
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionError:  # client went away mid-response, e.g. a killed harvest
+            pass
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        status, headers, body = self.server.mock.respond(parts.path, parts.query)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def load_fixtures(csv_paths=(), cache=None, synthetic=0):
+    """Fixtures from any mix of output CSVs, a recorded ResponseCache and synthetic pages"""
+    sets = []
+    if csv_paths:
+        sets.append(Fixtures.from_csv(csv_paths))
+    if cache:
+        sets.append(Fixtures.from_cache(cache))
+    if synthetic:
+        sets.append(Fixtures.synthetic(synthetic))
+    return Fixtures(fixture for fixtures in sets for fixture in fixtures.ordered)
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+#   python mock_loc.py --latency 0.05 --requests-per-minute 600
+#   python harvest.py --base-url http://127.0.0.1:8765 --requests-per-minute 600
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve loc.gov search/item JSON locally from fixtures")
+    parser.add_argument('csv', nargs='*', help="Output CSVs to build fixtures from (default: output/*.csv)")
+    parser.add_argument('--cache', default=None, metavar='PATH',
+                        help="Replay item/search JSON recorded in a ResponseCache (harvest.py --cache)")
+    parser.add_argument('--synthetic', type=int, default=0, metavar='N', help="Add N made-up pages")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Latency varies by +/- this fraction")
+    parser.add_argument('--page-size', type=int, default=100, help="Results per page when c is not given")
+    parser.add_argument('--max-page-size', type=int, default=1000)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered 429")
+    parser.add_argument('--requests-per-minute', type=int, default=None,
+                        help="429 with Retry-After once a client goes over this budget")
+    parser.add_argument('--retry-after', type=int, default=1)
+    args = parser.parse_args()
+
+    csv_paths = args.csv
+    if not csv_paths and not args.cache and not args.synthetic:
+        csv_paths = sorted(glob.glob(os.path.join('output', '*.csv')))
+    server = MockLocServer(load_fixtures(csv_paths, args.cache, args.synthetic), args.host, args.port,
+                           args.latency, args.jitter, args.page_size, args.max_page_size,
+                           args.error_rate, args.requests_per_minute, args.retry_after)
+    print(f"🧪 Serving {len(server.fixtures)} fixtures on {server.base_url} (Ctrl-C to stop)")
+    print(f"   python harvest.py --base-url {server.base_url} ...")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    server.httpd.server_close()
+    server.report()
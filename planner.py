@@ -0,0 +1,105 @@
+import asyncio
+import calendar
+from datetime import date, timedelta
+
+# ============================================================================
+# ADAPTIVE DATE-RANGE PLANNER
+# ============================================================================
+# Instead of always cutting a query into calendar years (create_year_chunks),
+# probe each range with a cheap c=1 request, read pagination.total, and keep
+# splitting - years -> months -> weeks -> days - until every chunk holds at
+# most `target_size` results. Sibling ranges are probed concurrently and every
+# chunk is an independent search URL the engine can paginate in parallel.
+
+PROBE_PARAMS = {"fo": "json", "c": 1, "at": "pagination"}
+
+
+def parse_date(value):
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def _month_end(day):
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def split_range(start, end):
+    """Next-finer calendar split of [start, end]: years, then months, weeks, days"""
+    pieces = []
+    if start.year != end.year:
+        piece_start = start
+        while piece_start <= end:
+            piece_end = min(date(piece_start.year, 12, 31), end)
+            pieces.append((piece_start, piece_end))
+            piece_start = piece_end + timedelta(days=1)
+    elif start.month != end.month:
+        piece_start = start
+        while piece_start <= end:
+            piece_end = min(_month_end(piece_start), end)
+            pieces.append((piece_start, piece_end))
+            piece_start = piece_end + timedelta(days=1)
+    else:
+        step = timedelta(days=7) if (end - start).days >= 7 else timedelta(days=1)
+        piece_start = start
+        while piece_start <= end:
+            piece_end = min(piece_start + step - timedelta(days=1), end)
+            pieces.append((piece_start, piece_end))
+            piece_start = piece_end + timedelta(days=1)
+    return pieces
+
+
+class DateChunk:
+    """A date range of one query and its probed result count"""
+
+    def __init__(self, start, end, total):
+        self.start = start
+        self.end = end
+        self.total = total
+
+    def __repr__(self):
+        return f"DateChunk({self.start}..{self.end}, total={self.total})"
+
+
+class RangePlanner:
+    """Split a query's date range until each chunk fits `target_size` results
+
+    `url_for(start, end)` returns the search URL for a sub-range (ISO dates);
+    probes go through the harvester, so they share its limiter and pool.
+    """
+
+    def __init__(self, harvester, target_size=1000):
+        self.harvester = harvester
+        self.target_size = target_size
+        self.probes = 0
+
+    async def probe_total(self, url):
+        self.probes += 1
+        data = await self.harvester.get_json(url, PROBE_PARAMS, phase='plan')
+        if data is None:
+            return None
+        return data.get('pagination', {}).get('total', 0)
+
+    async def plan(self, url_for, start_date, end_date):
+        start, end = parse_date(start_date), parse_date(end_date)
+        chunks = await self._plan(url_for, start, end)
+        chunks.sort(key=lambda chunk: chunk.start)
+        return chunks
+
+    async def _plan(self, url_for, start, end):
+        total = await self.probe_total(url_for(start.isoformat(), end.isoformat()))
+        if total == 0:
+            return []
+        # A failed probe or a single day can't be split further; crawl it as-is
+        if total is None or total <= self.target_size or start == end:
+            return [DateChunk(start, end, total)]
+        pieces = split_range(start, end)
+        planned = await asyncio.gather(*(self._plan(url_for, piece_start, piece_end)
+                                         for piece_start, piece_end in pieces))
+        return [chunk for chunks in planned for chunk in chunks]
+
+
+def describe_plan(name, chunks):
+    known = sum(chunk.total or 0 for chunk in chunks)
+    print(f"🧭 {name}: {len(chunks)} chunks, {known} results")
+    for chunk in chunks:
+        total = chunk.total if chunk.total is not None else '?'
+        print(f"   {chunk.start} .. {chunk.end}: {total}")
@@ -0,0 +1,155 @@
+import json
+import math
+import os
+import time
+from array import array
+from contextlib import contextmanager, nullcontext
+
+# ============================================================================
+# RUN PROFILE
+# ============================================================================
+# Where the wall time of a harvest goes. Every request records two spans -
+# the wait for a limiter token and the network round trip - and decoding,
+# row building, cache/store/checkpoint access and sink writes are timed as
+# they happen:
+#   network   client.get() until the response has arrived
+#   limiter   waiting for a token (includes 429 Retry-After pauses)
+#   parsing   JSON decoding and building PageRecords
+#   io        response cache, item store, checkpoints, CSV/Parquet writes
+# each split by phase (plan, search, item, write). Requests overlap, so span
+# totals are summed busy time and can exceed the wall time; the phase lines
+# (planning, harvesting, summary) are wall time summed over the jobs.
+#
+# Spans are not kept: each (category, phase) holds a count, sum, max and a
+# fixed log-scale histogram, so a national-scale harvest profiles in the
+# same few KB as a small one; p95 is read off the histogram (within 5%).
+
+CATEGORIES = ('network', 'limiter', 'parsing', 'io')
+
+
+class SpanStats:
+    """Count, total, max and a log-bucketed histogram of durations"""
+
+    SMALLEST = 1e-6  # seconds; shorter spans share the first bucket
+    GROWTH = 1.1  # bucket width ratio: quantiles are within 5% of the true value
+    BUCKETS = 250  # up to 1e-6 * 1.1 ** 250 s, about 2 days
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = array('L', bytes(self.BUCKETS * array('L').itemsize))
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        bucket = 0
+        if seconds > self.SMALLEST:
+            bucket = min(self.BUCKETS - 1, int(math.log(seconds / self.SMALLEST, self.GROWTH)) + 1)
+        self.histogram[bucket] += 1
+
+    def quantile(self, q):
+        """Geometric middle of the bucket holding the q-th quantile, capped at the max"""
+        rank = q * self.count
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= rank:
+                if bucket == 0:
+                    return min(self.SMALLEST, self.max)
+                return min(self.SMALLEST * self.GROWTH ** (bucket - 0.5), self.max)
+        return self.max
+
+
+class RunProfile:
+    """Timing spans of one run, aggregated by (category, phase)"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.finished = None
+        self.spans = {}
+        self.phases = {}
+
+    def record(self, category, phase, seconds):
+        stats = self.spans.get((category, phase))
+        if stats is None:
+            stats = self.spans[category, phase] = SpanStats()
+        stats.add(seconds)
+
+    @contextmanager
+    def span(self, category, phase):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(category, phase, time.monotonic() - started)
+
+    @contextmanager
+    def phase(self, name):
+        """Wall time of a pipeline phase; summed when several jobs run it"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.monotonic() - started
+
+    def finish(self):
+        self.finished = time.monotonic()
+
+    @property
+    def wall(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def to_dict(self):
+        spans = {}
+        for (category, phase), stats in sorted(self.spans.items()):
+            spans.setdefault(category, {})[phase] = {
+                'count': stats.count,
+                'seconds': stats.total,
+                'mean': stats.total / stats.count,
+                'p95': stats.quantile(0.95),
+                'max': stats.max,
+            }
+        return {
+            'wall_seconds': self.wall,
+            'phases': self.phases,
+            'categories': {category: sum(stats['seconds'] for stats in spans.get(category, {}).values())
+                           for category in CATEGORIES},
+            'spans': spans,
+        }
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        print(f"💾 Profile saved to {path}")
+
+    def report(self):
+        data = self.to_dict()
+        busy = sum(data['categories'].values())
+        wall = data['wall_seconds']
+        print(f"⏱️  RUN PROFILE: {wall:.1f}s ({wall / 60:.1f} min) total wall time")
+        if data['phases']:
+            print("   Phases (wall, summed over jobs): " + ", ".join(
+                f"{name} {seconds:.1f}s" for name, seconds in data['phases'].items()))
+        print("   Time in spans (summed over concurrent requests):")
+        for category in CATEGORIES:
+            seconds = data['categories'][category]
+            phases = data['spans'].get(category, {})
+            if not phases:
+                continue
+            share = seconds / busy if busy else 0
+            detail = ", ".join(f"{phase} {stats['seconds']:.1f}s/{stats['count']} "
+                               f"(p95 {stats['p95'] * 1000:.0f} ms)" for phase, stats in phases.items())
+            print(f"      {category:<8} {seconds:8.1f}s {share:4.0%}  {detail}")
+
+
+def span(profile, category, phase):
+    """profile.span(), or a no-op when there is no profile"""
+    return nullcontext() if profile is None else profile.span(category, phase)
+
+
+def phase(profile, name):
+    """profile.phase(), or a no-op when there is no profile"""
+    return nullcontext() if profile is None else profile.phase(name)
@@ -0,0 +1,187 @@
+import time
+
+# ============================================================================
+# LIVE PROGRESS AND ETA
+# ============================================================================
+# The scripts printed a fixed guess up front (len(item_ids) * 3.5 / 60
+# minutes) that was wrong as soon as a 429 backoff kicked in. Here the rate
+# is measured while the harvest runs:
+#   - items/s: exponentially weighted mean of the time between completed
+#     items, so the estimate follows backoffs and recoveries within a few
+#     dozen items; a pause still in progress slows it down right away
+#   - limiter wait: exponentially weighted mean wait per request
+#   - expected items: the search's pagination 'of', known after its first page
+# ETA = items still expected / current rate, per job and for the schedule.
+# ScheduleProgress.snapshot() returns the same numbers for code that wants
+# to act on them, e.g. start the longest jobs first.
+
+
+class EwmaRate:
+    """Events per second from an exponentially weighted mean of the gaps between them"""
+
+    def __init__(self, alpha=0.1, started=None):
+        self.alpha = alpha
+        self.interval = None
+        self.last = started if started is not None else time.monotonic()
+        self.count = 0
+
+    def tick(self, now=None):
+        now = time.monotonic() if now is None else now
+        gap = now - self.last
+        self.interval = gap if self.interval is None else self.alpha * gap + (1 - self.alpha) * self.interval
+        self.last = now
+        self.count += 1
+
+    def per_second(self, now=None):
+        """Current rate, or None before the first event"""
+        if self.interval is None:
+            return None
+        now = time.monotonic() if now is None else now
+        # No event for longer than the usual gap (e.g. a Retry-After pause): use that gap
+        interval = max(self.interval, now - self.last)
+        return 1 / interval if interval > 0 else None
+
+
+def _eta(remaining, rate):
+    if remaining == 0:
+        return 0.0
+    return remaining / rate if rate else None
+
+
+class JobProgress:
+    """Items expected and done for one job, with its item rate and limiter wait"""
+
+    def __init__(self, name, schedule=None, alpha=0.1):
+        self.name = name
+        self.schedule = schedule
+        self.alpha = alpha
+        self.expected = None
+        self.done = 0
+        self.failed = 0
+        self.restored = 0
+        self.rate = EwmaRate(alpha)
+        self.limiter_wait = None
+        self.finished = False
+
+    def add_expected(self, count):
+        """A search reported `count` results"""
+        self.expected = (self.expected or 0) + count
+
+    def add_restored(self, count):
+        """Items finished by an earlier run (checkpoint); they don't count towards the rate"""
+        self.restored += count
+
+    def item_done(self, failed=False, now=None):
+        now = time.monotonic() if now is None else now
+        self.done += 1
+        self.failed += failed
+        self.rate.tick(now)
+        if self.schedule is not None:
+            self.schedule.rate.tick(now)
+
+    def waited(self, seconds):
+        """A request waited `seconds` for the rate limiter"""
+        if self.limiter_wait is None:
+            self.limiter_wait = seconds
+        else:
+            self.limiter_wait = self.alpha * seconds + (1 - self.alpha) * self.limiter_wait
+
+    @property
+    def remaining(self):
+        if self.finished:
+            return 0
+        if self.expected is None:
+            return None
+        return max(0, self.expected - self.done - self.restored)
+
+    def eta(self, now=None):
+        """Seconds until this job is done at the current rate, or None if unknown"""
+        if self.remaining is None:
+            return None
+        return _eta(self.remaining, self.rate.per_second(now))
+
+    def finish(self):
+        self.finished = True
+
+    def snapshot(self, now=None):
+        rate = self.rate.per_second(now)
+        return {
+            'expected': self.expected,
+            'done': self.done + self.restored,
+            'failed': self.failed,
+            'items_per_min': rate * 60 if rate is not None else None,
+            'limiter_wait': self.limiter_wait,
+            'eta_seconds': self.eta(now),
+            'finished': self.finished,
+        }
+
+    def describe(self, now=None):
+        snapshot = self.snapshot(now)
+        line = f"{snapshot['done']}/{snapshot['expected'] if snapshot['expected'] is not None else '?'} items"
+        if self.finished:
+            return line + ", done"
+        if snapshot['items_per_min'] is not None:
+            line += f", {snapshot['items_per_min']:.1f}/min"
+        if snapshot['limiter_wait'] is not None:
+            line += f", limiter wait {snapshot['limiter_wait']:.1f}s/request"
+        return line + f", ETA {format_eta(snapshot['eta_seconds'])}"
+
+
+class ScheduleProgress:
+    """JobProgress for every job of a schedule, plus the rate over all of them"""
+
+    def __init__(self, alpha=0.1):
+        self.alpha = alpha
+        self.jobs = {}
+        self.rate = EwmaRate(alpha)
+
+    def job(self, name):
+        if name not in self.jobs:
+            self.jobs[name] = JobProgress(name, self, self.alpha)
+        return self.jobs[name]
+
+    def eta(self, now=None):
+        """Seconds until every job is done, or None while any running job's size is unknown
+
+        Jobs share one rate budget, so the overall rate is the better guide;
+        a straggler whose own ETA is longer still sets the end.
+        """
+        remaining = [job.remaining for job in self.jobs.values()]
+        if not remaining or None in remaining:
+            return None
+        overall = _eta(sum(remaining), self.rate.per_second(now))
+        etas = [job.eta(now) for job in self.jobs.values()]
+        if overall is None or None in etas:
+            return None
+        return max([overall, *etas])
+
+    def ranked(self, now=None):
+        """Unfinished job names, longest remaining time first (unknown ETAs first)"""
+        unfinished = [job for job in self.jobs.values() if not job.finished]
+        etas = {job.name: job.eta(now) for job in unfinished}
+        return sorted(etas, key=lambda name: -(float('inf') if etas[name] is None else etas[name]))
+
+    def snapshot(self, now=None):
+        now = time.monotonic() if now is None else now
+        rate = self.rate.per_second(now)
+        return {
+            'jobs': {name: job.snapshot(now) for name, job in self.jobs.items()},
+            'items_per_min': rate * 60 if rate is not None else None,
+            'eta_seconds': self.eta(now),
+        }
+
+    def report(self):
+        now = time.monotonic()
+        print(f"⏳ PROGRESS: ETA {format_eta(self.eta(now))}")
+        for name in self.ranked(now):
+            print(f"   {name}: {self.jobs[name].describe(now)}")
+
+
+def format_eta(seconds):
+    if seconds is None:
+        return "unknown"
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 90 * 60:
+        return f"{seconds / 60:.1f} min"
+    return f"{seconds / 3600:.1f} h"
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# ============================================================================
+# SHARED TOKEN-BUCKET RATE LIMITER
+# ============================================================================
+# One limiter for every script and for the async engine:
+#   - token bucket: `rate` tokens/second refill, up to `burst` saved up
+#   - AIMD: +`increase` req/s after each clean response, x`decrease` once per
+#     throttling episode (429s of requests already in flight land during the
+#     pause the first one started and don't cut the rate again)
+#   - Retry-After: a 429 pauses the whole bucket for as long as the server asks
+# wait() blocks (scripts), acquire() awaits (harvest_engine). Both draw from the
+# same bucket, so a process can mix them.
+
+
+def parse_retry_after(value, default=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return default
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucketLimiter:
+    """Token bucket with burst capacity, AIMD rate adaptation and Retry-After pauses"""
+
+    def __init__(self, rate=10 / 60, burst=3, min_rate=1 / 60, max_rate=20 / 60,
+                 increase=0.5 / 60, decrease=0.5, default_retry_after=30.0):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.default_retry_after = default_retry_after
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self.total_wait = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _reserve(self):
+        """Take one token now and return how long the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            # `updated` lies in the future while a Retry-After pause is running
+            if now > self.updated:
+                self._refill(now)
+            self.tokens -= 1
+            delay = max(0.0, self.updated - now) + max(0.0, -self.tokens) / self.rate
+            self.request_count += 1
+            self.total_wait += delay
+            return delay
+
+    def wait(self):
+        """Block until a request may be sent"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire(self):
+        """Await until a request may be sent"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def record_success(self):
+        """Additive increase after a clean response"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_rate_limited(self, retry_after=None):
+        """Multiplicative decrease on a 429; pause for Retry-After seconds
+
+        Only the first 429 of an episode cuts the rate; later ones while its
+        pause is running just extend the pause if they ask for longer.
+        Returns the pause in seconds so callers can report it.
+        """
+        if retry_after is None:
+            retry_after = self.default_retry_after
+        with self._lock:
+            now = time.monotonic()
+            if now > self.updated:
+                self._refill(now)
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.tokens = min(self.tokens, 0.0)
+            self.updated = max(self.updated, now + retry_after)
+            self.rate_limited_count += 1
+        return retry_after
+
+    @property
+    def requests_per_minute(self):
+        return self.rate * 60
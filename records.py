@@ -0,0 +1,330 @@
+import sys
+import tracemalloc
+from array import array
+
+from fields import CATEGORY_FIELDS, normalize_row
+
+# ============================================================================
+# PAGE METADATA RECORDS
+# ============================================================================
+# One schema for every extraction path. The scripts built nine-key dicts
+# with their own key names ('Page' vs 'Page Number', 'PDF' vs 'PDF Link') and
+# kept them in lists until the end. PageRecord is a __slots__ object - no
+# per-row dict - that still reads like the old rows (record['Issue Date'],
+# dict(record)), and RecordBatch stores many of them column-wise in arrays,
+# with the repeated text columns dictionary-encoded, ready for pandas/Arrow.
+
+# Column name -> attribute name
+COLUMNS = {
+    'Newspaper Title': 'title',
+    'Issue Date': 'issue_date',
+    'Page Number': 'page',
+    'LCCN': 'lccn',
+    'City': 'city',
+    'State': 'state',
+    'Contributor': 'contributor',
+    'Batch': 'batch',
+    'PDF Link': 'pdf',
+    'Year': 'year',
+}
+
+# Other spellings the scripts used for the same columns
+ALIASES = {
+    'Page': 'Page Number',
+    'PDF': 'PDF Link',
+    'Title': 'Newspaper Title',
+    'Date': 'Issue Date',
+}
+
+
+def _page_int(value):
+    """['4'] / '4' / 4 -> 4, like pagination.current in the item JSON; anything else None"""
+    if isinstance(value, list) and len(value) == 1:
+        value = value[0]
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def _year_int(value):
+    value = str(value or '')[:4]
+    return int(value) if value.isdigit() else None
+
+
+class PageRecord:
+    """Metadata for one newspaper page; also usable as a read/write mapping by column name"""
+
+    __slots__ = tuple(COLUMNS.values())
+
+    def __init__(self, title=None, issue_date=None, page=None, lccn=None, city=None, state=None,
+                 contributor=None, batch=None, pdf=None, year=None):
+        self.title = title
+        self.issue_date = issue_date
+        self.page = page
+        self.lccn = lccn
+        self.city = city
+        self.state = state
+        self.contributor = contributor
+        self.batch = batch
+        self.pdf = pdf
+        self.year = year
+
+    @classmethod
+    def from_row(cls, row):
+        """Record from a row dict in any of the scripts' spellings"""
+        if isinstance(row, cls):
+            return row
+        row = normalize_row({ALIASES.get(key, key): value for key, value in row.items()})
+        record = cls(**{COLUMNS[key]: value for key, value in row.items() if key in COLUMNS})
+        record.page = _page_int(record.page) if record.page is not None else None
+        if record.year is None or record.year == '':
+            record.year = _year_int(record.issue_date)
+        else:
+            record.year = _year_int(record.year)
+        return record
+
+    @classmethod
+    def from_item_json(cls, item_data):
+        """Record from an item's ?fo=json payload, or None if it has no 'item'"""
+        if 'item' not in item_data:
+            return None
+        item = item_data['item']
+        return cls.from_row({
+            'Newspaper Title': item.get('newspaper_title'),
+            'Issue Date': item.get('date'),
+            'Page Number': (item_data.get('pagination') or {}).get('current'),
+            'State': item.get('location_state'),
+            'City': item.get('location_city'),
+            'LCCN': item.get('number_lccn'),
+            'Contributor': item.get('contributor_names'),
+            'Batch': item.get('batch'),
+            'PDF Link': (item_data.get('resource') or {}).get('pdf'),
+        })
+
+    def as_row(self):
+        return {column: getattr(self, attr) for column, attr in COLUMNS.items()}
+
+    # Mapping interface, so code written against row dicts keeps working
+    def keys(self):
+        return COLUMNS.keys()
+
+    def __iter__(self):
+        return iter(COLUMNS)
+
+    def __len__(self):
+        return len(COLUMNS)
+
+    def __contains__(self, column):
+        return ALIASES.get(column, column) in COLUMNS
+
+    def __getitem__(self, column):
+        return getattr(self, COLUMNS[ALIASES.get(column, column)])
+
+    def __setitem__(self, column, value):
+        setattr(self, COLUMNS[ALIASES.get(column, column)], value)
+
+    def get(self, column, default=None):
+        return self[column] if column in self else default
+
+    def __eq__(self, other):
+        if isinstance(other, PageRecord):
+            return self.as_row() == other.as_row()
+        return NotImplemented
+
+    def __repr__(self):
+        return f"PageRecord({self.title!r}, {self.issue_date!r}, page={self.page!r})"
+
+
+# ============================================================================
+# COLUMNAR BATCH
+# ============================================================================
+
+class _DictionaryColumn:
+    """Repeated strings stored once, plus one int code per row (-1 = missing)"""
+
+    def __init__(self):
+        self.codes = array('i')
+        self.values = []
+        self.index = {}
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+            return
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, i):
+        code = self.codes[i]
+        return None if code < 0 else self.values[code]
+
+
+class _IntColumn:
+    """Small ints in a typed array, with `missing` standing in for None"""
+
+    def __init__(self, typecode, missing):
+        self.data = array(typecode)
+        self.missing = missing
+
+    def append(self, value):
+        self.data.append(self.missing if value is None else value)
+
+    def __getitem__(self, i):
+        value = self.data[i]
+        return None if value == self.missing else value
+
+
+class RecordBatch:
+    """Append-only column store of PageRecords
+
+    Title, date, LCCN, city, state, contributor and batch are dictionary
+    encoded, page and year live in typed arrays, and only the PDF links (one
+    per page) stay as separate strings. Iterating yields PageRecords;
+    to_dataframe()/to_arrow() build categoricals straight from the codes.
+    """
+
+    DICTIONARY = ('title', 'issue_date', 'lccn', 'city', 'state', 'contributor', 'batch')
+
+    def __init__(self, records=()):
+        self.columns = {attr: _DictionaryColumn() for attr in self.DICTIONARY}
+        self.columns['page'] = _IntColumn('i', -1)
+        self.columns['year'] = _IntColumn('h', -1)
+        self.columns['pdf'] = []
+        self.length = 0
+        self.extend(records)
+
+    def append(self, record):
+        record = PageRecord.from_row(record)
+        for attr, column in self.columns.items():
+            column.append(getattr(record, attr))
+        self.length += 1
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError(i)
+        return PageRecord(**{attr: column[i] for attr, column in self.columns.items()})
+
+    def __iter__(self):
+        for i in range(self.length):
+            yield self[i]
+
+    def _int_array(self, attr):
+        """(numpy values, missing mask) of a typed-array column, without a per-row loop"""
+        import numpy as np
+        column = self.columns[attr]
+        if isinstance(column, _DictionaryColumn):
+            values = np.array(column.codes, dtype=np.int32)
+            return values, values < 0
+        values = np.array(column.data, dtype=np.int32 if column.data.typecode == 'i' else np.int16)
+        return values, values == column.missing
+
+    def to_dataframe(self):
+        """DataFrame in the CSV column order: categoricals, datetime64 Issue Date, nullable int pages"""
+        import numpy as np
+        import pandas as pd
+        from normalize import parse_dates
+
+        data = {}
+        for column, attr in COLUMNS.items():
+            values = self.columns[attr]
+            if attr == 'issue_date':
+                # Parse each distinct date once, then broadcast by code (-1 picks the trailing NaT)
+                parsed, unparsable = parse_dates(values.values)
+                if len(unparsable):
+                    print(f"⚠️  Unparsable '{column}' values (left empty): {', '.join(map(repr, unparsable[:5]))}")
+                dates = np.append(parsed.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT', 'ns'))
+                data[column] = dates[self._int_array(attr)[0]]
+            elif isinstance(values, _DictionaryColumn):
+                categorical = pd.Categorical.from_codes(self._int_array(attr)[0],
+                                                        categories=pd.Index(values.values, dtype=object))
+                data[column] = categorical if column in CATEGORY_FIELDS else np.asarray(categorical, dtype=object)
+            elif attr == 'pdf':
+                data[column] = pd.Series(values, dtype=object)
+            else:
+                data[column] = pd.arrays.IntegerArray(*self._int_array(attr))
+        return pd.DataFrame(data)
+
+    def to_arrow(self):
+        """pyarrow Table with dictionary-encoded text columns (needs pyarrow)"""
+        import pyarrow as pa
+
+        arrays = {}
+        for column, attr in COLUMNS.items():
+            values = self.columns[attr]
+            if attr == 'pdf':
+                arrays[column] = pa.array(values, type=pa.string())
+                continue
+            data, missing = self._int_array(attr)
+            if isinstance(values, _DictionaryColumn):
+                indices = pa.array(data, mask=missing, type=pa.int32())
+                arrays[column] = pa.DictionaryArray.from_arrays(indices, pa.array(values.values, type=pa.string()))
+            else:
+                arrays[column] = pa.array(data, mask=missing)
+        return pa.table(arrays)
+
+
+# ============================================================================
+# MEMORY MEASUREMENT
+# ============================================================================
+
+def _sample_rows(rows):
+    titles = [f'The {city.title()} daily herald.' for city in ('wheeling', 'richmond', 'new york', 'albany')]
+    for i in range(rows):
+        day = f'187{i % 5}-{i % 12 + 1:02d}-{i % 28 + 1:02d}'
+        yield {
+            'Newspaper Title': [titles[i % 4]],
+            'Issue Date': day,
+            'Page Number': i % 8 + 1,
+            'LCCN': [f'sn8302{i % 4:04d}'],
+            'City': [['wheeling', 'richmond', 'new york', 'albany'][i % 4]],
+            'State': [['west virginia', 'virginia', 'new york', 'new york'][i % 4]],
+            'Contributor': ['Library of Congress, Washington, DC'],
+            'Batch': [f'dlc_batch{i % 20}_ver01'],
+            'PDF Link': f'https://tile.loc.gov/storage-services/service/ndnp/dlc/batch/data/{i:09d}/0001.pdf',
+            'Year': day[:4],
+        }
+
+
+def _measure(build):
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def measure_memory(rows=100_000):
+    """Bytes held per `rows` rows: list of dicts vs. list of PageRecords vs. RecordBatch"""
+    def dict_rows():
+        # What the scripts kept: fresh strings per row, the way response.json() returns them
+        return [{key: (list(map(''.join, value)) if isinstance(value, list) else value)
+                 for key, value in row.items()} for row in _sample_rows(rows)]
+
+    results = {
+        'list of dicts': _measure(dict_rows),
+        'list of PageRecords': _measure(lambda: [PageRecord.from_row(row) for row in dict_rows()]),
+        'RecordBatch': _measure(lambda: RecordBatch(dict_rows())),
+    }
+    print(f"🧮 MEMORY PER {rows:,} ROWS:")
+    for name, size in results.items():
+        print(f"   {name}: {size / 1024 ** 2:.1f} MB ({size / rows:.0f} bytes/row)")
+    return results
+
+
+if __name__ == "__main__":
+    measure_memory(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
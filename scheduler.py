@@ -0,0 +1,307 @@
+import asyncio
+import itertools
+import os
+import sys
+import time
+from collections import deque
+from urllib.parse import urlencode
+
+from checkpoint import CheckpointJournal
+from harvest_engine import ConnectionStats, Harvester, make_client
+from planner import RangePlanner, describe_plan
+from profiling import phase, span
+from progress import ScheduleProgress
+from rate_limiter import TokenBucketLimiter
+from sinks import CsvSink, ParquetSink
+
+# ============================================================================
+# MULTI-QUERY JOB SCHEDULER
+# ============================================================================
+# Runs a matrix of (keyword, state, date range) queries in one process. Every
+# job draws from ONE global TokenBucketLimiter, but tokens are handed out
+# round-robin between jobs that are waiting, so a small state gets every
+# N-th request instead of queueing behind New York's thousands.
+
+BASE_URL = 'https://www.loc.gov/collections/chronicling-america/'
+
+STATE_ABBREVIATIONS = {
+    'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR', 'california': 'CA',
+    'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE', 'district of columbia': 'DC',
+    'florida': 'FL', 'georgia': 'GA', 'hawaii': 'HI', 'idaho': 'ID', 'illinois': 'IL',
+    'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS', 'kentucky': 'KY', 'louisiana': 'LA',
+    'maine': 'ME', 'maryland': 'MD', 'massachusetts': 'MA', 'michigan': 'MI',
+    'minnesota': 'MN', 'mississippi': 'MS', 'missouri': 'MO', 'montana': 'MT',
+    'nebraska': 'NE', 'nevada': 'NV', 'new hampshire': 'NH', 'new jersey': 'NJ',
+    'new mexico': 'NM', 'new york': 'NY', 'north carolina': 'NC', 'north dakota': 'ND',
+    'ohio': 'OH', 'oklahoma': 'OK', 'oregon': 'OR', 'pennsylvania': 'PA',
+    'puerto rico': 'PR', 'rhode island': 'RI', 'south carolina': 'SC',
+    'south dakota': 'SD', 'tennessee': 'TN', 'texas': 'TX', 'utah': 'UT', 'vermont': 'VT',
+    'virginia': 'VA', 'washington': 'WA', 'west virginia': 'WV', 'wisconsin': 'WI',
+    'wyoming': 'WY',
+}
+STATE_NAMES = {abbr: name for name, abbr in STATE_ABBREVIATIONS.items()}
+
+
+def state_name(state):
+    """'WV', 'West Virginia' or 'west+virginia' -> 'west virginia'"""
+    state = state.replace('+', ' ').strip()
+    name = STATE_NAMES.get(state.upper(), state.lower())
+    if name not in STATE_ABBREVIATIONS:
+        raise ValueError(f"Unknown state: {state!r}")
+    return name
+
+
+def search_url(keyword, state, start_date, end_date):
+    """Advanced-search URL in the same shape the scripts hardcode"""
+    params = {
+        'dl': 'page',
+        'end_date': end_date,
+        'ops': 'AND',
+        'qs': keyword,
+        'searchType': 'advanced',
+        'start_date': start_date,
+    }
+    if state:
+        params['location_state'] = state
+    params['fo'] = 'json'
+    return f"{BASE_URL}?{urlencode(params)}"
+
+
+class HarvestJob:
+    """One (keyword, state, date range) query and the CSV it writes"""
+
+    def __init__(self, keyword, state, start_date, end_date, output=None, save_to='output'):
+        self.keyword = keyword
+        self.state = state_name(state) if state else None
+        self.start_date = start_date
+        self.end_date = end_date
+        abbr = STATE_ABBREVIATIONS[self.state] if self.state else 'US'
+        self.name = f"{keyword}_{abbr}_{start_date[:4]}_{end_date[:4]}"
+        self.output = output or os.path.join(save_to, f"{self.name}.csv")
+        self.chunks = None
+        self.rows = 0
+        self.bad_dates = 0
+        self.bad_date_examples = []
+        self.elapsed = None
+
+    @property
+    def search_url(self):
+        return search_url(self.keyword, self.state, self.start_date, self.end_date)
+
+    def chunk_url(self, start_date, end_date):
+        return search_url(self.keyword, self.state, start_date, end_date)
+
+    @property
+    def search_urls(self):
+        """One URL per planned date chunk, or the whole range if unplanned"""
+        if self.chunks is None:
+            return [self.search_url]
+        return [self.chunk_url(chunk.start.isoformat(), chunk.end.isoformat())
+                for chunk in self.chunks]
+
+    def __repr__(self):
+        return f"HarvestJob({self.name})"
+
+
+def job_matrix(keywords, states, date_ranges, save_to='output'):
+    """Every (keyword, state, (start, end)) combination as a HarvestJob"""
+    return [HarvestJob(keyword, state, start, end, save_to=save_to)
+            for keyword, state, (start, end) in itertools.product(keywords, states, date_ranges)]
+
+
+# ============================================================================
+# FAIR QUEUING OVER ONE GLOBAL LIMITER
+# ============================================================================
+class FairQueue:
+    """Round-robin gate in front of a shared limiter, one FIFO per job"""
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+        self.waiting = {}
+        self.turns = deque()
+        self.granted = {}
+        self._dispatcher = None
+
+    def for_job(self, name):
+        return JobLimiter(self, name)
+
+    async def acquire(self, name):
+        future = asyncio.get_running_loop().create_future()
+        queue = self.waiting.setdefault(name, deque())
+        if not queue:
+            self.turns.append(name)
+        queue.append(future)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+        await future
+
+    async def _dispatch(self):
+        while self.turns:
+            name = self.turns.popleft()
+            queue = self.waiting[name]
+            future = queue.popleft()
+            if queue:
+                self.turns.append(name)
+            if future.cancelled():
+                continue
+            await self.limiter.acquire()
+            if not future.done():
+                self.granted[name] = self.granted.get(name, 0) + 1
+                future.set_result(None)
+
+
+class JobLimiter:
+    """A job's view of the FairQueue; drop-in limiter for Harvester"""
+
+    def __init__(self, fair_queue, name):
+        self.fair_queue = fair_queue
+        self.name = name
+
+    async def acquire(self):
+        await self.fair_queue.acquire(self.name)
+
+    def record_success(self):
+        self.fair_queue.limiter.record_success()
+
+    def record_rate_limited(self, retry_after=None):
+        return self.fair_queue.limiter.record_rate_limited(retry_after)
+
+    @property
+    def requests_per_minute(self):
+        return self.fair_queue.limiter.requests_per_minute
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+class JobScheduler:
+    """Run many HarvestJobs at once under one rate budget and connection pool"""
+
+    def __init__(self, jobs, limiter=None, max_connections=8, per_job_concurrency=4,
+                 target_chunk_size=None, journal_dir=None, work_queue=None,
+                 parquet_root=None, metrics=None, profile=None, progress_every=30,
+                 **harvester_options):
+        self.jobs = list(jobs)
+        self.limiter = limiter or TokenBucketLimiter()
+        self.fair_queue = FairQueue(self.limiter)
+        self.max_connections = max_connections
+        self.per_job_concurrency = per_job_concurrency
+        self.target_chunk_size = target_chunk_size
+        self.journal_dir = journal_dir
+        self.work_queue = work_queue
+        self.parquet_root = parquet_root
+        self.metrics = metrics
+        self.profile = profile
+        # Live per-job and overall ETAs; read self.progress.snapshot() to act on them
+        self.progress = ScheduleProgress()
+        for job in self.jobs:
+            self.progress.job(job.name)
+        self.progress_every = progress_every
+        self.harvester_options = harvester_options
+        self.harvesters = {}
+
+    async def run_job(self, job, client):
+        started = time.monotonic()
+        checkpoint = self.work_queue.for_job(job.name) if self.work_queue is not None else None
+        if self.journal_dir:
+            checkpoint = CheckpointJournal(os.path.join(self.journal_dir, f"{job.name}.jsonl"))
+        harvester = Harvester(concurrency=self.per_job_concurrency,
+                              limiter=self.fair_queue.for_job(job.name),
+                              client=client, name=job.name, checkpoint=checkpoint,
+                              metrics=self.metrics, profile=self.profile,
+                              progress=self.progress.job(job.name), **self.harvester_options)
+        self.harvesters[job.name] = harvester
+        async with harvester:
+            if self.target_chunk_size:
+                with phase(self.profile, 'planning'):
+                    planner = RangePlanner(harvester, self.target_chunk_size)
+                    job.chunks = await planner.plan(job.chunk_url, job.start_date, job.end_date)
+                describe_plan(job.name, job.chunks)
+            sinks = [CsvSink(job.output)]
+            if self.parquet_root:
+                sinks.append(ParquetSink(self.parquet_root, constants={'Keyword': job.keyword},
+                                         name=job.name))
+            written = None
+            if self.metrics is not None:
+                written = [self.metrics.rows_written.labels(job.name, type(sink).__name__)
+                           for sink in sinks]
+            try:
+                with phase(self.profile, 'harvesting'):
+                    async for row in harvester.harvest(job.search_urls):
+                        with span(self.profile, 'io', 'write'):
+                            for sink in sinks:
+                                sink.write(row)
+                        if written is not None:
+                            for counter in written:
+                                counter.inc()
+            finally:
+                with span(self.profile, 'io', 'write'):
+                    for sink in sinks:
+                        sink.close()
+        if self.journal_dir:
+            checkpoint.close()
+        job.rows = sinks[0].rows
+        job.bad_dates, job.bad_date_examples = sinks[0].bad_dates, sinks[0].bad_date_examples
+        job.elapsed = time.monotonic() - started
+        self.progress.job(job.name).finish()
+        print(f"✅ {job.name}: {job.rows} rows in {job.elapsed / 60:.1f} min -> {job.output}")
+        return job
+
+    async def run(self):
+        # Pool options go to the one shared client; every Harvester gets it passed in
+        client_options = {key: self.harvester_options.pop(key) for key in ('transport', 'http2', 'keepalive_expiry')
+                          if key in self.harvester_options}
+        reporter = asyncio.ensure_future(self.report_progress()) if self.progress_every else None
+        try:
+            async with make_client(self.harvester_options.get('headers'),
+                                   self.harvester_options.get('timeout', 30.0),
+                                   max_connections=self.max_connections, **client_options) as client:
+                return await asyncio.gather(*(self.run_job(job, client) for job in self.jobs))
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+
+    async def report_progress(self):
+        """Print the live ETAs every `progress_every` seconds"""
+        while True:
+            await asyncio.sleep(self.progress_every)
+            self.progress.report()
+
+    def report(self):
+        print("📊 JOBS:")
+        for job in sorted(self.jobs, key=lambda job: job.elapsed or 0):
+            minutes = f"{job.elapsed / 60:.1f} min" if job.elapsed is not None else "not run"
+            requests = self.fair_queue.granted.get(job.name, 0)
+            print(f"   {job.name}: {job.rows} rows, {requests} requests, {minutes}")
+        print(f"   Total requests: {self.limiter.request_count} "
+              f"({self.limiter.rate_limited_count} rate limited)")
+        bad = [job for job in self.jobs if job.bad_dates]
+        if bad:
+            print(f"⚠️  {sum(job.bad_dates for job in bad)} unparsable 'Issue Date' values (written as-is):")
+            for job in bad:
+                examples = ', '.join(repr(value) for value in job.bad_date_examples)
+                print(f"   {job.name}: {job.bad_dates}, e.g. {examples}")
+        if not self.harvesters:
+            return
+        harvesters = self.harvesters.values()
+        print("📥 METADATA:")
+        print(f"   Item JSON requests: {sum(harvester.item_fetches for harvester in harvesters)}")
+        if any(harvester.extract == 'search' for harvester in harvesters):
+            print(f"   Rows built from search results only: "
+                  f"{sum(harvester.search_only_rows for harvester in harvesters)}")
+        ConnectionStats.combined(harvester.connections for harvester in harvesters).report()
+
+
+def run_jobs(jobs, **scheduler_options):
+    scheduler = JobScheduler(jobs, **scheduler_options)
+    asyncio.run(scheduler.run())
+    scheduler.report()
+    return scheduler.jobs
+
+
+# ============================================================================
+# MAIN EXECUTION
+# ============================================================================
+if __name__ == '__main__':
+    from harvest import main
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import csv
+import os
+from datetime import datetime
+from functools import lru_cache
+
+from fields import normalize_row
+from records import PageRecord
+
+# ============================================================================
+# STREAMING OUTPUT SINKS
+# ============================================================================
+# Rows are written as soon as they are extracted instead of being held in
+# item_metadata_list until the end, so memory stays flat however large the
+# harvest is, and a crash keeps everything written so far.
+
+# Column layout of the output/coolie_*.csv files
+CSV_COLUMNS = ['Newspaper Title', 'Issue Date', 'Page Number', 'LCCN', 'City', 'State',
+               'Contributor', 'Batch', 'PDF Link']
+
+
+@lru_cache(maxsize=8192)  # a harvest spans a few thousand distinct days at most
+def _parse_date(value):
+    """'1873-01-31' (time part ignored) -> date, or None if unparsable"""
+    if isinstance(value, str) and len(value) >= 10:
+        try:
+            return datetime.strptime(value[:10], '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    return None
+
+
+class CsvSink:
+    """Append rows to a CSV as they arrive, flushing every `flush_every` rows
+
+    List-valued fields are written as plain values (sn83030313, several
+    joined with '; ') instead of the "['sn83030313']" of the older
+    output/coolie_*.csv files, which normalize.load_csv() still reads.
+    Issue Dates that don't parse are written as they came and counted in
+    `bad_dates`, with the first few kept in `bad_date_examples`.
+    """
+
+    def __init__(self, path, columns=CSV_COLUMNS, flush_every=50):
+        self.path = path
+        self.columns = columns
+        self.flush_every = flush_every
+        self.rows = 0
+        self.bad_dates = 0
+        self.bad_date_examples = []
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=columns, extrasaction='ignore',
+                                     lineterminator='\n')
+        self.writer.writeheader()
+
+    def write(self, row):
+        row = normalize_row(dict(row))
+        issue_date = row.get('Issue Date', '')
+        parsed = _parse_date(issue_date) if isinstance(issue_date, str) else None
+        if parsed is not None:
+            row['Issue Date'] = parsed.strftime('%m-%d-%Y')  # the scripts' MM-DD-YYYY
+        elif issue_date not in ('', None):
+            self.bad_dates += 1
+            if len(self.bad_date_examples) < 5:
+                self.bad_date_examples.append(issue_date)
+        self.writer.writerow(row)
+        self.rows += 1
+        if self.rows % self.flush_every == 0:
+            self.file.flush()
+
+    def close(self):
+        self.file.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ParquetSink:
+    """Typed Parquet dataset partitioned by State and Year (needs pyarrow)
+
+    Rows are buffered and written `batch_size` at a time as new part files
+    under `root/State=<state>/Year=<year>/`; with a `name`, the part files are
+    prefixed with it and a rerun replaces them. Dates are real dates, page numbers
+    ints, and the low-cardinality text columns dictionary-encoded, so e.g.
+
+        pd.read_parquet('output/parquet', filters=[('State', '=', 'new york')])
+
+    loads one state without reparsing "['...']" strings.
+    """
+
+    def __init__(self, root, batch_size=10000, constants=None, name=None):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow: pip install pyarrow") from None
+        self.pa = pa
+        self.pq = pq
+        self.root = root
+        self.batch_size = batch_size
+        self.constants = constants or {}
+        self.name = name
+        self.buffer = []
+        self.rows = 0
+        self.flushes = 0
+        dictionary = pa.dictionary(pa.int32(), pa.string())
+        fields = [
+            pa.field('Newspaper Title', dictionary),
+            pa.field('Issue Date', pa.date32()),
+            pa.field('Page Number', pa.int32()),
+            pa.field('LCCN', dictionary),
+            pa.field('City', dictionary),
+            pa.field('State', pa.string()),
+            pa.field('Contributor', dictionary),
+            pa.field('Batch', dictionary),
+            pa.field('PDF Link', pa.string()),
+            pa.field('Year', pa.int16()),
+        ]
+        fields += [pa.field(name, dictionary) for name in self.constants]
+        self.schema = pa.schema(fields)
+        os.makedirs(root, exist_ok=True)
+        if name:
+            # A rerun of the same job replaces its earlier part files
+            for directory, _, files in os.walk(root):
+                for filename in files:
+                    if filename.startswith(f"{name}-") and filename.endswith('.parquet'):
+                        os.remove(os.path.join(directory, filename))
+
+    def write(self, row):
+        record = PageRecord.from_row(row)  # harvest rows already are: returned as-is
+        self.buffer.append({
+            'Newspaper Title': record.title,
+            'Issue Date': _parse_date(record.issue_date) if isinstance(record.issue_date, str) else None,
+            'Page Number': record.page,
+            'LCCN': record.lccn,
+            'City': record.city,
+            'State': record.state or 'unknown',
+            'Contributor': record.contributor,
+            'Batch': record.batch,
+            'PDF Link': record.pdf,
+            'Year': record.year or 0,
+            **self.constants,
+        })
+        self.rows += 1
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        table = self.pa.Table.from_pylist(self.buffer, schema=self.schema)
+        options = {}
+        if self.name:
+            options['basename_template'] = f"{self.name}-{self.flushes}-{{i}}.parquet"
+        self.pq.write_to_dataset(table, self.root, partition_cols=['State', 'Year'], **options)
+        self.buffer = []
+        self.flushes += 1
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
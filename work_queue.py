@@ -0,0 +1,166 @@
+import json
+import os
+import sqlite3
+import time
+
+# ============================================================================
+# CRASH-SAFE RESUMABLE WORK QUEUE (SQLite)
+# ============================================================================
+# Durable state for both phases of a harvest, so `--resume` continues exactly
+# where a dead run stopped instead of starting over from searchURL:
+#   cursors: one per search URL - where pagination continues, 'in_flight'
+#            until the last page has been read, then 'done'
+#   items:   pending -> in_flight -> done | failed, with the extracted row
+#            stored on 'done' and an attempt counter for retries
+# Items left 'in_flight' by a crash are simply picked up again. Both tables
+# are keyed by job as well: with --chunk-size overlapping jobs plan the same
+# chunk URLs, and each must keep its own cursor, items and attempts.
+# for_job() returns the view with the same checkpoint hooks as
+# CheckpointJournal, so Harvester takes either one.
+
+DEFAULT_PATH = os.path.join('cache', 'work_queue.sqlite')
+
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class WorkQueue:
+    """SQLite-backed queue of search cursors and item fetches"""
+
+    def __init__(self, path=DEFAULT_PATH, max_attempts=3):
+        self.path = path
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        columns = {column for _, column, *_ in self.db.execute('PRAGMA table_info(items)')}
+        if columns and 'job' not in columns:
+            # Queues from before jobs were recorded can't be split between them
+            self.db.execute('DROP TABLE IF EXISTS cursors')
+            self.db.execute('DROP TABLE items')
+        self.db.execute('''CREATE TABLE IF NOT EXISTS cursors (
+                               job TEXT NOT NULL,
+                               search TEXT NOT NULL,
+                               next_url TEXT,
+                               state TEXT NOT NULL,
+                               pages INTEGER NOT NULL DEFAULT 0,
+                               updated REAL NOT NULL,
+                               PRIMARY KEY (job, search))''')
+        self.db.execute('''CREATE TABLE IF NOT EXISTS items (
+                               job TEXT NOT NULL,
+                               item_id TEXT NOT NULL,
+                               search TEXT NOT NULL,
+                               seq INTEGER NOT NULL,
+                               state TEXT NOT NULL,
+                               attempts INTEGER NOT NULL DEFAULT 0,
+                               row TEXT,
+                               updated REAL NOT NULL,
+                               PRIMARY KEY (job, search, item_id))''')
+        self.db.execute('CREATE INDEX IF NOT EXISTS items_by_state ON items (job, search, state, seq)')
+
+    def for_job(self, name):
+        return JobQueue(self, name)
+
+    def reset(self):
+        """Forget everything - a fresh (non --resume) run"""
+        self.db.execute('BEGIN')
+        with self.db:
+            self.db.execute('DELETE FROM cursors')
+            self.db.execute('DELETE FROM items')
+
+    # Hooks called by harvest_engine.Harvester, directly (job '') or through JobQueue
+    def resume_state(self, search_url, job=''):
+        """(next page URL or None, unfinished item IDs) or None if never started"""
+        cursor = self.db.execute('SELECT next_url, state FROM cursors WHERE job = ? AND search = ?',
+                                 (job, search_url)).fetchone()
+        if cursor is None:
+            return None
+        next_url, state = cursor
+        pending = [item_id for (item_id,) in self.db.execute(
+            '''SELECT item_id FROM items WHERE job = ? AND search = ? AND state != ? AND attempts < ?
+               ORDER BY seq''', (job, search_url, DONE, self.max_attempts))]
+        return (None if state == DONE else next_url), pending
+
+    def done_rows(self, search_url, job=''):
+        return [json.loads(row) for (row,) in self.db.execute(
+            'SELECT row FROM items WHERE job = ? AND search = ? AND state = ? ORDER BY seq',
+            (job, search_url, DONE))]
+
+    def page_done(self, search_url, next_url, item_ids, job=''):
+        now = time.time()
+        self.db.execute('BEGIN')
+        with self.db:
+            found = self.db.execute('SELECT COALESCE(MAX(seq), -1) FROM items WHERE job = ? AND search = ?',
+                                    (job, search_url)).fetchone()[0]
+            self.db.executemany(
+                '''INSERT OR IGNORE INTO items (job, item_id, search, seq, state, updated)
+                   VALUES (?, ?, ?, ?, ?, ?)''',
+                [(job, item_id, search_url, found + 1 + offset, PENDING, now)
+                 for offset, item_id in enumerate(item_ids)])
+            self.db.execute(
+                '''INSERT INTO cursors (job, search, next_url, state, pages, updated) VALUES (?, ?, ?, ?, 1, ?)
+                   ON CONFLICT (job, search) DO UPDATE SET next_url = excluded.next_url,
+                       state = excluded.state, pages = pages + 1, updated = excluded.updated''',
+                (job, search_url, next_url, DONE if next_url is None else IN_FLIGHT, now))
+
+    def _set_item(self, job, search_url, item_id, state, row=None, attempt=False):
+        # Scoped by job and search: overlapping jobs/chunks each keep their own row and attempts
+        self.db.execute(
+            f'''UPDATE items SET state = ?, row = COALESCE(?, row), updated = ?
+                {', attempts = attempts + 1' if attempt else ''}
+                WHERE job = ? AND search = ? AND item_id = ?''',
+            (state, json.dumps(dict(row)) if row is not None else None, time.time(),
+             job, search_url, item_id))
+
+    def item_started(self, search_url, item_id, job=''):
+        self._set_item(job, search_url, item_id, IN_FLIGHT, attempt=True)
+
+    def item_done(self, search_url, item_id, row, job=''):
+        self._set_item(job, search_url, item_id, DONE, row)
+
+    def item_failed(self, search_url, item_id, job=''):
+        self._set_item(job, search_url, item_id, FAILED)
+
+    def counts(self):
+        items = dict(self.db.execute('SELECT state, COUNT(*) FROM items GROUP BY state'))
+        cursors = dict(self.db.execute('SELECT state, COUNT(*) FROM cursors GROUP BY state'))
+        return cursors, items
+
+    def report(self):
+        cursors, items = self.counts()
+        print("🧾 WORK QUEUE:")
+        print(f"   Searches: {cursors.get(DONE, 0)} done, {cursors.get(IN_FLIGHT, 0)} unfinished")
+        print("   Items: " + ", ".join(f"{items.get(state, 0)} {state}"
+                                       for state in (DONE, PENDING, IN_FLIGHT, FAILED)))
+
+    def close(self):
+        self.db.close()
+
+
+class JobQueue:
+    """One job's view of the WorkQueue; drop-in checkpoint for Harvester"""
+
+    def __init__(self, work_queue, name):
+        self.work_queue = work_queue
+        self.name = name
+
+    def resume_state(self, search_url):
+        return self.work_queue.resume_state(search_url, self.name)
+
+    def done_rows(self, search_url):
+        return self.work_queue.done_rows(search_url, self.name)
+
+    def page_done(self, search_url, next_url, item_ids):
+        self.work_queue.page_done(search_url, next_url, item_ids, self.name)
+
+    def item_started(self, search_url, item_id):
+        self.work_queue.item_started(search_url, item_id, self.name)
+
+    def item_done(self, search_url, item_id, row):
+        self.work_queue.item_done(search_url, item_id, row, self.name)
+
+    def item_failed(self, search_url, item_id):
+        self.work_queue.item_failed(search_url, item_id, self.name)